@@ -1,7 +1,10 @@
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db import transaction
 from .models import Collection, CustomUser, Link
-from .utils import fetch_og_data
+from .tasks import apply_og_data, fetch_og_data_or_none, retry_link_enrichment
+from .utils import canonical_url_hash
 
 
 class LinkInline(admin.TabularInline):
@@ -19,7 +22,8 @@ class LinkInline(admin.TabularInline):
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
     model = CustomUser
-    list_display = ("id", "email", "is_staff", "is_active", "date_joined")
+    list_display = ("id", "email", "link_total", "is_staff", "is_active", "date_joined")
+    list_select_related = ("link_stats",)
     list_filter = ("is_staff", "is_active")
     search_fields = ("email",)
     ordering = ("email",)
@@ -40,17 +44,52 @@ class CustomUserAdmin(UserAdmin):
     )
     inlines = [LinkInline]
 
+    @admin.display(description="Links", ordering="link_stats__total")
+    def link_total(self, obj):
+        stats = getattr(obj, "link_stats", None)
+        return stats.total if stats else 0
+
+
+class LinkAdminForm(forms.ModelForm):
+    class Meta:
+        model = Link
+        fields = "__all__"
+
+    def clean(self):
+        cleaned_data = super().clean()
+        url = cleaned_data.get("url")
+        user = cleaned_data.get("user") or getattr(self.instance, "user", None)
+
+        if url and user:
+            duplicates = Link.objects.filter(
+                user=user, url_hash=canonical_url_hash(url)
+            ).exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                self.add_error("url", "This user has already added this link.")
+        return cleaned_data
+
 
 @admin.register(Link)
 class LinkAdmin(admin.ModelAdmin):
-    list_display = ("id", "url", "title", "user", "type", "created_at", "updated_at")
+    form = LinkAdminForm
+    list_display = (
+        "id",
+        "url",
+        "title",
+        "user",
+        "type",
+        "enrichment_status",
+        "created_at",
+        "updated_at",
+    )
     search_fields = ("title", "url", "description")
-    list_filter = ("user", "type", "created_at")
+    list_filter = ("user", "type", "enrichment_status", "created_at")
     readonly_fields = (
         "title",
         "description",
         "image",
         "type",
+        "enrichment_status",
         "created_at",
         "updated_at",
     )
@@ -61,23 +100,29 @@ class LinkAdmin(admin.ModelAdmin):
         return self.readonly_fields
 
     def save_model(self, request, obj, form, change):
-        if change and "url" in form.changed_data or not change:
-            og_data = fetch_og_data(obj.url)
-            if og_data:
-                obj.title = og_data.get("title", "")
-                obj.description = og_data.get("description", "")
-                obj.image = og_data.get("image", "")
-                obj.type = og_data.get("type", obj.type)
+        fetch = change and "url" in form.changed_data or not change
+        if fetch:
+            apply_og_data(obj, fetch_og_data_or_none(obj.url))
         super().save_model(request, obj, form, change)
+        if fetch and obj.enrichment_status == Link.ENRICHMENT_PENDING:
+            transaction.on_commit(lambda: retry_link_enrichment(obj.pk))
 
 
 @admin.register(Collection)
 class CollectionAdmin(admin.ModelAdmin):
-    list_display = ("id", "title", "user", "created_at", "updated_at")
+    list_display = (
+        "id",
+        "title",
+        "user",
+        "link_count",
+        "last_link_added_at",
+        "created_at",
+        "updated_at",
+    )
     search_fields = ("title", "description")
     list_filter = ("user", "created_at", "updated_at")
     filter_horizontal = ("links",)
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("link_count", "last_link_added_at", "created_at", "updated_at")
 
     def get_readonly_fields(self, request, obj=None):
         if obj:
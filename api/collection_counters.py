@@ -0,0 +1,59 @@
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Now
+
+from api.models import Collection
+
+LinkCollections = Collection.links.through
+
+
+def memberships():
+    return (
+        LinkCollections.objects.filter(collection_id=OuterRef("pk"))
+        .order_by()
+        .values("collection_id")
+    )
+
+
+def link_count_subquery():
+    counts = memberships().annotate(count=Count("*")).values("count")
+    return Coalesce(Subquery(counts), 0)
+
+
+def last_link_created_subquery():
+    # The join table has no timestamps, so last_link_added_at is defined as
+    # the created_at of the newest member link; it can be recomputed at any
+    # time and goes down again when that link leaves the collection.
+    newest = memberships().annotate(newest=Max("link__created_at")).values("newest")
+    return Subquery(newest)
+
+
+def counter_values():
+    # QuerySet.update() skips auto_now; bump updated_at explicitly so the
+    # conditional GET validators of the collection change with its members.
+    return {
+        "link_count": link_count_subquery(),
+        "last_link_added_at": last_link_created_subquery(),
+        "updated_at": Now(),
+    }
+
+
+def lock_collections(collection_ids):
+    """Lock the collection rows in primary key order; must run in a transaction."""
+    collections = Collection.objects.filter(pk__in=collection_ids)
+    list(collections.order_by("pk").select_for_update().values_list("pk"))
+    return collections
+
+
+def recount_collections(collection_ids):
+    """Recompute the counters of the given collections from the join table.
+
+    The collection rows are locked first, so concurrent membership changes
+    are applied one after another and the count is never lost.
+    """
+    collection_ids = sorted(set(collection_ids))
+    if not collection_ids:
+        return
+
+    with transaction.atomic():
+        lock_collections(collection_ids).update(**counter_values())
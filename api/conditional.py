@@ -0,0 +1,92 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+    quote_etag,
+)
+from django.utils.http import http_date
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified support for read-only viewset actions.
+
+    Views implement ``get_validator_querysets()``. The latest ``updated_at``
+    and the row count of each queryset are read with one aggregate query
+    apiece; when they match the client's validators the view answers 304
+    before the main query or the serializer runs.
+    """
+
+    conditional_actions = ("list", "retrieve", "search")
+
+    def get_validator_querysets(self):
+        raise NotImplementedError
+
+    def get_conditional_validators(self):
+        parts = [
+            str(self.request.user.pk),
+            self.request.get_full_path(),
+            self.request.accepted_media_type or "",
+        ]
+        last_modified = None
+        for queryset in self.get_validator_querysets():
+            aggregates = queryset.order_by().aggregate(
+                last_modified=Max("updated_at"), count=Count("pk")
+            )
+            updated_at = aggregates["last_modified"]
+            parts.append(
+                f"{updated_at.isoformat() if updated_at else ''}:{aggregates['count']}"
+            )
+            if updated_at and (last_modified is None or updated_at > last_modified):
+                last_modified = updated_at
+
+        etag = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+        return quote_etag(etag), last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_validators = None
+        if request.method not in ("GET", "HEAD"):
+            return
+        if self.action not in self.conditional_actions:
+            return
+
+        try:
+            validators = self.get_conditional_validators()
+        except (TypeError, ValueError):
+            # Malformed lookup value; let the action itself answer with 404.
+            return
+
+        self.conditional_validators = etag, last_modified = validators
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, "conditional_validators", None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified.timestamp())
+            # Let clients and shared caches keep the body but always revalidate.
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ["Authorization"])
+        return response
@@ -0,0 +1,65 @@
+from django.db import models
+from django.db.models import F
+from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
+
+from api.models import Link, UserLinkStats
+from api.utils import extract_host
+
+
+class LinkFilter(filters.FilterSet):
+    # Every filter is backed by an index that starts with user_id (see
+    # Link.Meta.indexes), as all link querysets are scoped to one user.
+    # Enrichment also sets the "object" and "error" types, which are not in
+    # Link.TYPE_CHOICES.
+    type = filters.ChoiceFilter(
+        choices=[(value, value) for value in UserLinkStats.TYPES]
+    )
+    type__in = filters.BaseInFilter(field_name="type")
+    host = filters.CharFilter(method="filter_host", label="Host name, e.g. github.com")
+
+    class Meta:
+        model = Link
+        fields = {
+            "created_at": ["gte", "lt"],
+            "updated_at": ["gte", "lt"],
+        }
+        filter_overrides = {
+            models.DateTimeField: {"filter_class": filters.IsoDateTimeFilter},
+        }
+
+    def filter_host(self, queryset, name, value):
+        # Accept either a bare host name or a full URL.
+        host = extract_host(value if "://" in value else f"//{value}")
+        return queryset.filter(host=host)
+
+
+def with_tiebreak(ordering):
+    """Append ``-id`` to ``ordering`` unless it already orders by the primary key."""
+    ordering = list(ordering)
+    if not {"id", "-id", "pk", "-pk"} & {str(field) for field in ordering}:
+        ordering.append("-id")
+    return ordering
+
+
+class NullsLastOrderingFilter(OrderingFilter):
+    """``OrderingFilter`` that sorts NULLs last for the view's ``nulls_last_fields``.
+
+    PostgreSQL puts NULLs first in descending order, which would list e.g.
+    empty collections before the most recently active ones.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+
+        nulls_last_fields = getattr(view, "nulls_last_fields", ())
+        ordering = [
+            F(field[1:]).desc(nulls_last=True)
+            if field.startswith("-") and field[1:] in nulls_last_fields
+            else field
+            for field in ordering
+        ]
+        # Break ties on the primary key so that pages are stable.
+        return queryset.order_by(*with_tiebreak(ordering))
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+
+class HostUnavailable(Exception):
+    pass
+
+
+class HostState:
+    def __init__(self, host, max_in_flight):
+        self.host = host
+        self.max_in_flight = max_in_flight
+        self.semaphore = threading.BoundedSemaphore(max_in_flight)
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.short_circuited = 0
+        self.rejected = 0
+
+    def allow(self, now, cooldown):
+        if self.opened_at is None:
+            return True
+        if now - self.opened_at < cooldown or self.probe_in_flight:
+            return False
+        # Cooldown is over: let a single probe through (half-open).
+        self.probe_in_flight = True
+        return True
+
+    def state(self, now, cooldown):
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at < cooldown:
+            return "open"
+        return "half_open"
+
+
+class HostGuard:
+    """Per-host in-flight limit plus a consecutive-failure circuit breaker."""
+
+    def __init__(
+        self,
+        max_in_flight,
+        wait_timeout,
+        failure_threshold,
+        cooldown,
+        max_tracked_hosts,
+    ):
+        self.max_in_flight = max_in_flight
+        self.wait_timeout = wait_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_tracked_hosts = max_tracked_hosts
+        self._hosts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = HostState(host, self.max_in_flight)
+                self._hosts[host] = state
+                while len(self._hosts) > self.max_tracked_hosts:
+                    self._hosts.popitem(last=False)
+            self._hosts.move_to_end(host)
+            return state
+
+    def _record(self, state, failed):
+        with self._lock:
+            state.probe_in_flight = False
+            if not failed:
+                state.consecutive_failures = 0
+                state.opened_at = None
+                return
+            state.consecutive_failures += 1
+            if state.consecutive_failures >= self.failure_threshold:
+                state.opened_at = time.monotonic()
+
+    @contextmanager
+    def guard(self, host):
+        state = self._get_state(host)
+
+        with self._lock:
+            allowed = state.allow(time.monotonic(), self.cooldown)
+            if not allowed:
+                state.short_circuited += 1
+        if not allowed:
+            raise HostUnavailable(f"Circuit breaker is open for {host}")
+
+        if not state.semaphore.acquire(timeout=self.wait_timeout):
+            with self._lock:
+                state.rejected += 1
+                state.probe_in_flight = False
+            raise HostUnavailable(f"Too many concurrent requests to {host}")
+
+        with self._lock:
+            state.in_flight += 1
+        try:
+            yield
+        except Exception as e:
+            self._record(state, failed=is_host_failure(e))
+            raise
+        else:
+            self._record(state, failed=False)
+        finally:
+            with self._lock:
+                state.in_flight -= 1
+            state.semaphore.release()
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "host": state.host,
+                    "state": state.state(now, self.cooldown),
+                    "in_flight": state.in_flight,
+                    "consecutive_failures": state.consecutive_failures,
+                    "short_circuited": state.short_circuited,
+                    "rejected": state.rejected,
+                    "retry_in": (
+                        max(0.0, round(self.cooldown - (now - state.opened_at), 1))
+                        if state.opened_at is not None
+                        else None
+                    ),
+                }
+                for state in self._hosts.values()
+            ]
+
+
+def is_host_failure(exc):
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code >= 500
+    return False
+
+
+_guard = None
+_guard_lock = threading.Lock()
+
+
+def get_host_guard():
+    global _guard
+    if _guard is None:
+        with _guard_lock:
+            if _guard is None:
+                _guard = HostGuard(
+                    max_in_flight=settings.OUTBOUND_HTTP_MAX_PER_HOST,
+                    wait_timeout=settings.OUTBOUND_HTTP_HOST_WAIT_TIMEOUT,
+                    failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                    cooldown=settings.CIRCUIT_BREAKER_COOLDOWN,
+                    max_tracked_hosts=settings.CIRCUIT_BREAKER_MAX_TRACKED_HOSTS,
+                )
+    return _guard
+
+
+def guard_url(url):
+    return get_host_guard().guard((urlsplit(url).hostname or "").lower())
+
+
+def get_host_stats():
+    guard = get_host_guard()
+    return {
+        "max_in_flight": guard.max_in_flight,
+        "failure_threshold": guard.failure_threshold,
+        "cooldown": guard.cooldown,
+        "hosts": guard.stats(),
+    }
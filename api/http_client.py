@@ -0,0 +1,103 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.OUTBOUND_HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.OUTBOUND_HTTP_POOL_MAXSIZE,
+        pool_block=settings.OUTBOUND_HTTP_POOL_BLOCK,
+        max_retries=0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = settings.OUTBOUND_HTTP_USER_AGENT
+    # The session is shared by every request thread, so never carry cookies
+    # from one user's fetch into another's.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_http_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get_timeout():
+    return (
+        settings.OUTBOUND_HTTP_CONNECT_TIMEOUT,
+        settings.OUTBOUND_HTTP_READ_TIMEOUT,
+    )
+
+
+def http_get(url, **kwargs):
+    kwargs.setdefault("timeout", get_timeout())
+    return get_http_session().get(url, **kwargs)
+
+
+def release_connection(response, chunks):
+    # A streamed response closed before the body is fully read drops its
+    # connection instead of returning it to the pool. Small remainders are
+    # cheaper to drain than a new TCP/TLS handshake. ``chunks`` is the
+    # iter_content() iterator the body was read with: closing it half-way
+    # would close the connection too. Chunked bodies have no Content-Length,
+    # so read at most the drain limit and give up beyond it.
+    limit = settings.OUTBOUND_HTTP_DRAIN_LIMIT
+    remaining = response.raw.length_remaining
+    if remaining is not None and remaining > limit:
+        return
+    drained = 0
+    try:
+        for chunk in chunks:
+            drained += len(chunk)
+            if drained > limit:
+                return
+    except RequestException:
+        return
+    response.raw.release_conn()
+
+
+def get_pool_stats():
+    session = get_http_session()
+    adapter = session.get_adapter("https://")
+    pools = []
+
+    for key in adapter.poolmanager.pools.keys():
+        pool = adapter.poolmanager.pools.get(key)
+        if pool is None:
+            continue
+        idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        pools.append(
+            {
+                "scheme": pool.scheme,
+                "host": pool.host,
+                "port": pool.port,
+                "maxsize": pool.pool.maxsize,
+                "in_use": pool.pool.maxsize - pool.pool.qsize(),
+                "idle": idle,
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+            }
+        )
+
+    return {
+        "pool_connections": settings.OUTBOUND_HTTP_POOL_CONNECTIONS,
+        "pool_maxsize": settings.OUTBOUND_HTTP_POOL_MAXSIZE,
+        "pool_block": settings.OUTBOUND_HTTP_POOL_BLOCK,
+        "connect_timeout": settings.OUTBOUND_HTTP_CONNECT_TIMEOUT,
+        "read_timeout": settings.OUTBOUND_HTTP_READ_TIMEOUT,
+        "pools": pools,
+    }
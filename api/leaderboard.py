@@ -0,0 +1,66 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.models import UserLinkDailyStats
+
+WINDOWS = (7, 30, 90)
+
+
+def encode_cursor(row, rank):
+    position = [row["count_links"], row["date_joined"].isoformat(), row["user_id"], rank]
+    return urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(value):
+    """Return ``(count_links, date_joined, user_id, rank)``; ValueError if malformed."""
+    try:
+        count, date_joined, user_id, rank = json.loads(urlsafe_b64decode(value))
+        date_joined = parse_datetime(date_joined)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor.")
+    if date_joined is None or not all(
+        isinstance(number, int) for number in (count, user_id, rank)
+    ):
+        raise ValueError("Invalid cursor.")
+    return count, date_joined, user_id, rank
+
+
+def get_leaderboard(window, link_type=None, limit=10, cursor=None):
+    """Rank users by links added in the last ``window`` days, from the daily rollups.
+
+    Ties are broken by ``date_joined`` and then by user id, which also makes
+    ``(count_links, date_joined, user_id)`` a unique keyset for the cursor.
+    Returns ``(rows, next_cursor)``.
+    """
+    since = timezone.localdate() - timedelta(days=window - 1)
+    rows = UserLinkDailyStats.objects.filter(day__gte=since)
+    if link_type:
+        rows = rows.filter(type=link_type)
+    rows = (
+        rows.values("user_id", email=F("user__email"), date_joined=F("user__date_joined"))
+        .annotate(count_links=Sum("count"))
+        .filter(count_links__gt=0)
+    )
+
+    rank = 0
+    if cursor:
+        count, date_joined, user_id, rank = cursor
+        rows = rows.filter(
+            Q(count_links__lt=count)
+            | Q(count_links=count, date_joined__gt=date_joined)
+            | Q(count_links=count, date_joined=date_joined, user_id__gt=user_id)
+        )
+
+    rows = list(rows.order_by("-count_links", "date_joined", "user_id")[: limit + 1])
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    for offset, row in enumerate(rows, start=rank + 1):
+        row["rank"] = offset
+
+    next_cursor = encode_cursor(rows[-1], rows[-1]["rank"]) if has_next else None
+    return rows, next_cursor
@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
+
+from api.collection_counters import LinkCollections, recount_collections
+from api.filters import LinkFilter
+from api.link_stats import apply_link_deltas, count_link_types, retype_deltas
+from api.models import Link
+
+
+def select_link_ids(user, ids=None, filters=None):
+    """Lock and return the IDs of ``user``'s links selected by ``ids`` or ``filters``.
+
+    Ownership is checked with a single query; must run inside a transaction.
+    """
+    links = Link.objects.filter(user=user).order_by()
+
+    if ids is not None:
+        selected = list(
+            links.filter(pk__in=ids).select_for_update().values_list("pk", flat=True)
+        )
+        missing = sorted(set(ids) - set(selected))
+        if missing:
+            raise NotFound({"detail": f"Links with IDs {missing} not found."})
+        return selected
+
+    filterset = LinkFilter(filters, queryset=links)
+    if not filterset.is_valid():
+        raise ValidationError({"filter": filterset.errors})
+    # LinkFilter skips empty values, which would select the whole library.
+    values = filterset.form.cleaned_data.values()
+    if not any(value not in (None, "", []) for value in values):
+        raise ValidationError({"filter": ["At least one non-empty filter is required."]})
+    return list(filterset.qs.select_for_update().values_list("pk", flat=True))
+
+
+def bulk_delete_links(user, ids=None, filters=None):
+    with transaction.atomic():
+        link_ids = select_link_ids(user, ids, filters)
+        if not link_ids:
+            return 0
+        links = Link.objects.filter(pk__in=link_ids)
+        apply_link_deltas(count_link_types(links, sign=-1))
+        collection_ids = set(
+            LinkCollections.objects.filter(link_id__in=link_ids).values_list(
+                "collection_id", flat=True
+            )
+        )
+        # Counters and collections are updated here in one go, so the per-link
+        # delete receivers in api.signals skip links deleted through this flag.
+        links.updates_link_counters = True
+        _, deleted = links.delete()
+        recount_collections(collection_ids)
+        return deleted.get(Link._meta.label, 0)
+
+
+def bulk_update_links(user, values, ids=None, filters=None):
+    with transaction.atomic():
+        link_ids = select_link_ids(user, ids, filters)
+        if not link_ids:
+            return 0
+        links = Link.objects.filter(pk__in=link_ids)
+        if "type" in values:
+            apply_link_deltas(
+                retype_deltas(count_link_types(links, sign=-1), values["type"])
+            )
+        return links.update(**values, updated_at=timezone.now())
@@ -0,0 +1,57 @@
+import csv
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef
+
+from api.models import Collection
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class Echo:
+    """File-like object whose write() hands the row back to the csv writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(links, fields, include_collections=False):
+    """Return the exported field names and a server-side cursor over ``links``."""
+    if include_collections:
+        # A correlated subquery keeps it one query without a GROUP BY, so rows
+        # still stream in index order.
+        memberships = Collection.links.through.objects.filter(
+            link_id=OuterRef("pk")
+        ).values("collection_id")
+        links = links.annotate(collection_ids=ArraySubquery(memberships))
+        fields = [*fields, "collection_ids"]
+
+    rows = links.values(*fields).iterator(chunk_size=settings.LINK_EXPORT_CHUNK_SIZE)
+    return fields, rows
+
+
+def iter_ndjson(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def format_csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return " ".join(map(str, value))
+    return value
+
+
+def iter_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([format_csv_value(row[name]) for name in fields])
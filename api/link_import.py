@@ -0,0 +1,244 @@
+import codecs
+import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import URLValidator
+from django.db import IntegrityError, transaction
+
+from api.link_stats import record_created_links
+from api.models import Link
+from api.tasks import (
+    apply_og_data,
+    enqueue_link_enrichment,
+    fetch_og_data_or_none,
+    retry_link_enrichment,
+)
+from api.utils import canonical_url_hash, extract_host
+
+url_validator = URLValidator()
+URL_MAX_LENGTH = Link._meta.get_field("url").max_length
+JSON_READ_SIZE = 8192
+# An item that is still incomplete after this many characters is rejected
+# instead of buffering the rest of the body.
+JSON_ITEM_MAX_LENGTH = 16384
+json_decoder = json.JSONDecoder()
+
+
+def parse_import_item(item):
+    if isinstance(item, dict):
+        item = item.get("url")
+    if not isinstance(item, str):
+        return None
+    return item.strip()
+
+
+def read_text(stream, decoder):
+    """Return ``(text, eof)`` for the next chunk of a UTF-8 byte stream."""
+    chunk = stream.read(JSON_READ_SIZE)
+    return decoder.decode(chunk, final=not chunk), not chunk
+
+
+def iter_json_urls(stream):
+    """Stream ``(url, raw_item)`` pairs out of a JSON array, item by item.
+
+    Raises ValueError right away if the body is not a JSON array. Only one
+    item is buffered at a time, so a syntax error further on cannot be known
+    upfront: it ends the array with an invalid item instead.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer, eof = "", False
+    while not buffer.strip() and not eof:
+        text, eof = read_text(stream, decoder)
+        buffer += text
+    buffer = buffer.lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array of URLs.")
+    return iter_json_items(stream, decoder, buffer[1:], eof)
+
+
+def iter_json_items(stream, decoder, buffer, eof):
+    expect_item = True
+    empty = True
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer and not eof:
+            text, eof = read_text(stream, decoder)
+            buffer += text
+            continue
+        if buffer.startswith("]") and (empty or not expect_item):
+            return
+        if not expect_item:
+            if not buffer.startswith(","):
+                yield None, buffer[:200]
+                return
+            buffer = buffer[1:]
+            expect_item = True
+            continue
+
+        try:
+            item, end = json_decoder.raw_decode(buffer)
+        except ValueError:
+            end = None
+        # An item that ends with the buffer may continue in the next chunk.
+        if end is None or end == len(buffer):
+            if not eof and len(buffer) <= JSON_ITEM_MAX_LENGTH:
+                text, eof = read_text(stream, decoder)
+                buffer += text
+                continue
+            if end is None:
+                yield None, buffer[:200]
+                return
+
+        yield parse_import_item(item), item
+        buffer = buffer[end:]
+        expect_item = False
+        empty = False
+
+
+def iter_ndjson_urls(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield None, line.decode("utf-8", errors="replace")[:200]
+            continue
+        yield parse_import_item(item), item
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def validate_import_url(url):
+    if not url:
+        return "A URL string or an object with a 'url' key is required."
+    if len(url) > URL_MAX_LENGTH:
+        return f"URL is longer than {URL_MAX_LENGTH} characters."
+    try:
+        url_validator(url)
+    except DjangoValidationError:
+        return "Enter a valid URL."
+    return None
+
+
+def import_links(user, items, executor):
+    """Import ``(url, raw_item)`` pairs for ``user`` batch by batch.
+
+    Yields one result dict per input item; only one batch of links is held in
+    memory at a time.
+    """
+    for batch in chunked(items, settings.LINK_IMPORT_BATCH_SIZE):
+        yield from import_batch(user, batch, executor)
+
+
+def import_batch(user, batch, executor):
+    results = [None] * len(batch)
+    candidates = {}
+
+    for index, (url, raw_item) in enumerate(batch):
+        error = validate_import_url(url)
+        if error:
+            results[index] = {"url": raw_item, "status": "invalid", "detail": error}
+            continue
+
+        url_hash = canonical_url_hash(url)
+        if url_hash in candidates:
+            results[index] = {"url": url, "status": "duplicate"}
+        else:
+            candidates[url_hash] = (index, url)
+
+    existing = Link.objects.filter(
+        user=user, url_hash__in=candidates.keys()
+    ).values_list("url_hash", flat=True)
+    for url_hash in existing:
+        index, url = candidates.pop(url_hash)
+        results[index] = {"url": url, "status": "duplicate"}
+
+    links = build_links(user, [url for _, url in candidates.values()], executor)
+    for link in insert_links(user, links):
+        index, url = candidates[link.url_hash]
+        results[index] = {
+            "url": url,
+            "status": "created",
+            "id": link.id,
+            "enrichment_status": link.enrichment_status,
+        }
+    for index, url in candidates.values():
+        if results[index] is None:
+            results[index] = {
+                "url": url,
+                "status": "duplicate",
+                "detail": "This URL was saved concurrently by another request.",
+            }
+
+    return results
+
+
+def build_links(user, urls, executor):
+    if settings.LINK_ENRICHMENT_ASYNC:
+        links = [
+            Link(user=user, url=url, enrichment_status=Link.ENRICHMENT_PENDING)
+            for url in urls
+        ]
+    else:
+        links = []
+        for url, og_data in zip(urls, executor.map(fetch_og_data_or_none, urls)):
+            link = Link(user=user, url=url)
+            apply_og_data(link, og_data)
+            links.append(link)
+
+    # bulk_create() bypasses Link.save(), which normally sets these.
+    for link in links:
+        link.url_hash = canonical_url_hash(link.url)
+        link.host = extract_host(link.url)
+    return links
+
+
+def insert_links(user, links):
+    created = []
+    while links:
+        try:
+            with transaction.atomic():
+                created = Link.objects.bulk_create(links)
+                record_created_links(created)
+            break
+        except IntegrityError:
+            # A concurrent request saved some of these URLs after our existence
+            # check; retry with only the ones that are still free, for as long
+            # as other requests keep taking some of them.
+            taken = set(
+                Link.objects.filter(
+                    user=user, url_hash__in=[link.url_hash for link in links]
+                ).values_list("url_hash", flat=True)
+            )
+            free = [link for link in links if link.url_hash not in taken]
+            if len(free) == len(links):
+                raise
+            links = free
+
+    # Without background enrichment, pending links are the ones whose host
+    # was unavailable; retry them once its breaker may have closed.
+    enqueue = (
+        enqueue_link_enrichment
+        if settings.LINK_ENRICHMENT_ASYNC
+        else retry_link_enrichment
+    )
+    for link in created:
+        if link.enrichment_status == Link.ENRICHMENT_PENDING:
+            transaction.on_commit(lambda link_id=link.id: enqueue(link_id))
+    return created
+
+
+def get_import_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.LINK_IMPORT_FETCH_WORKERS,
+        thread_name_prefix="link-import",
+    )
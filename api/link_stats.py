@@ -0,0 +1,124 @@
+from collections import Counter, defaultdict
+
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from api.models import UserLinkDailyStats, UserLinkStats
+
+COLUMNS = ["total", *UserLinkStats.TYPES]
+
+
+def count_link_types(links, sign=1):
+    """Return ``Counter({(user_id, day, type): n})`` for a Link queryset in one query."""
+    deltas = Counter()
+    rows = (
+        links.order_by()
+        .values("user_id", "type", day=TruncDate("created_at"))
+        .annotate(n=Count("pk"))
+    )
+    for row in rows:
+        deltas[row["user_id"], row["day"], row["type"]] += sign * row["n"]
+    return deltas
+
+
+def link_day(link):
+    return timezone.localdate(link.created_at)
+
+
+def values_sql(rows):
+    row_sql = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+    return ", ".join([row_sql] * len(rows)), [value for row in rows for value in row]
+
+
+def add_to_counters(table, keys, columns, rows, touch=False):
+    """Add ``rows`` of ``[*keys, *deltas]`` to the counter ``columns`` of ``table``.
+
+    Counters are changed with relative UPDATEs, which lock the rows, so
+    concurrent writers never lose an increment. Rows that do not exist yet are
+    upserted, but only when the first delta is positive: a cascade delete of a
+    user must not bring its counter rows back.
+    """
+    if not rows:
+        return
+
+    key_list = ", ".join(keys)
+    column_list = ", ".join(columns)
+    touch_sql = ", updated_at = now()" if touch else ""
+    with connection.cursor() as cursor:
+        sql, params = values_sql(rows)
+        assignments = ", ".join(f"{name} = s.{name} + d.{name}" for name in columns)
+        matches = " AND ".join(f"s.{name} = d.{name}" for name in keys)
+        cursor.execute(
+            f"UPDATE {table} AS s SET {assignments}{touch_sql} "
+            f"FROM (VALUES {sql}) AS d ({key_list}, {column_list}) "
+            f"WHERE {matches} RETURNING {', '.join(f's.{name}' for name in keys)}",
+            params,
+        )
+        updated = set(cursor.fetchall())
+
+        missing = [
+            row
+            for row in rows
+            if tuple(row[: len(keys)]) not in updated and row[len(keys)] > 0
+        ]
+        if missing:
+            sql, params = values_sql(missing)
+            assignments = ", ".join(
+                f"{name} = {table}.{name} + EXCLUDED.{name}" for name in columns
+            )
+            cursor.execute(
+                f"INSERT INTO {table} ({key_list}, {column_list}"
+                f"{', updated_at' if touch else ''}) "
+                f"SELECT *{', now()' if touch else ''} FROM (VALUES {sql}) AS d "
+                f"ON CONFLICT ({key_list}) DO UPDATE SET {assignments}{touch_sql}",
+                params,
+            )
+
+
+def apply_link_deltas(deltas):
+    """Apply ``Counter({(user_id, day, type): delta})`` to both counter tables.
+
+    The per-user totals are written first, so their row lock also orders
+    concurrent writers of the same user's daily rows.
+    """
+    users = defaultdict(Counter)
+    daily = []
+    for (user_id, day, link_type), delta in sorted(deltas.items()):
+        if delta:
+            users[user_id][link_type] += delta
+            daily.append([user_id, day, link_type, delta])
+
+    rows = []
+    for user_id, counter in users.items():
+        values = [counter.get(name, 0) for name in UserLinkStats.TYPES]
+        total = sum(counter.values())
+        if total or any(values):
+            rows.append([user_id, total, *values])
+
+    add_to_counters(UserLinkStats._meta.db_table, ["user_id"], COLUMNS, rows, touch=True)
+    add_to_counters(
+        UserLinkDailyStats._meta.db_table, ["user_id", "day", "type"], ["count"], daily
+    )
+
+
+def record_link_changes(link, old_type=None, new_type=None):
+    deltas = Counter()
+    if old_type is not None:
+        deltas[link.user_id, link_day(link), old_type] -= 1
+    if new_type is not None:
+        deltas[link.user_id, link_day(link), new_type] += 1
+    apply_link_deltas(deltas)
+
+
+def record_created_links(links):
+    apply_link_deltas(Counter((link.user_id, link_day(link), link.type) for link in links))
+
+
+def retype_deltas(deltas, link_type):
+    """Deltas that move the links counted (negatively) in ``deltas`` to ``link_type``."""
+    moved = Counter(deltas)
+    for (user_id, day, _), delta in deltas.items():
+        moved[user_id, day, link_type] -= delta
+    return moved
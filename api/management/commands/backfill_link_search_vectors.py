@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.models import Link
+from api.search import LINK_SEARCH_VECTOR
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill Link.search_vector for rows created before the search trigger existed. "
+        "Rows are updated in small id-ordered batches, each in its own transaction, "
+        "so only the rows of the current batch are locked."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches to limit load on the database.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute vectors for every link, not only the missing ones.",
+        )
+
+    def handle(self, *args, **options):
+        links = Link.objects.order_by("id")
+        if not options["all"]:
+            links = links.filter(search_vector__isnull=True)
+
+        last_id = 0
+        updated = 0
+        while True:
+            batch_ids = list(
+                links.filter(id__gt=last_id).values_list("id", flat=True)[
+                    : options["batch_size"]
+                ]
+            )
+            if not batch_ids:
+                break
+
+            updated += Link.objects.filter(id__in=batch_ids).update(
+                search_vector=LINK_SEARCH_VECTOR
+            )
+            last_id = batch_ids[-1]
+            self.stdout.write(f"Updated {updated} links (last id {last_id})")
+
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} search vectors."))
@@ -0,0 +1,123 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+
+from api.link_stats import apply_link_deltas, count_link_types
+from api.models import Link
+from api.search import similarity_search, substring_search
+
+User = get_user_model()
+
+BENCH_EMAIL = "search-benchmark@example.com"
+
+SEED_SQL = """
+WITH seed AS (
+    SELECT i, (ARRAY['github.com', 'soundcloud.com', 'bbc.com', 'vimeo.com',
+                     'goodreads.com', 'realpython.com', 'pypi.org'])[1 + i %% 7] AS host
+    FROM generate_series(%(start)s, %(stop)s) AS i
+)
+INSERT INTO api_link (user_id, url, url_hash, host, title, description, image, type,
+                      enrichment_status, created_at, updated_at)
+SELECT %(user_id)s,
+       'https://' || host
+           || '/' || md5(i::text) || '/' || (ARRAY['python', 'music', 'news', 'video',
+                                                   'book', 'requests', 'django'])[1 + i %% 5],
+       encode(sha256(('benchmark:' || i)::bytea), 'hex'),
+       host,
+       (ARRAY['Python tutorial', 'Hey Jude', 'World news', 'Never Gonna Give You Up',
+              'War and Peace', 'Requests guide', 'Django docs'])[1 + i %% 7] || ' ' || i,
+       NULL, NULL,
+       (ARRAY['website', 'book', 'article', 'music', 'video'])[1 + i %% 5],
+       'ready', now() - i * interval '1 second', now() - i * interval '1 second'
+FROM seed
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a benchmark user with N links and compare link search timings "
+        "with and without the trigram indexes. The benchmark user and its links "
+        "are deleted afterwards unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--query", default="requests")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the benchmark user and its links for the next run.",
+        )
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(email=BENCH_EMAIL)
+        self.seed(user, options["rows"])
+
+        links = Link.objects.filter(user=user)
+        query = options["query"].lower()
+        queries = {
+            "substring": substring_search(links, query),
+            "similar": similarity_search(links, query)[:50],
+        }
+
+        for name, queryset in queries.items():
+            seq = self.measure(queryset, options["repeat"], use_indexes=False)
+            idx = self.measure(queryset, options["repeat"], use_indexes=True)
+            self.stdout.write(
+                f"{name:<10} seq scan {seq:9.1f} ms | "
+                f"trigram index {idx:9.1f} ms | speedup x{seq / idx:.1f}"
+            )
+
+        if not options["keep"]:
+            self.cleanup(user)
+
+    def seed(self, user, rows):
+        existing = Link.objects.filter(user=user).count()
+        if existing >= rows:
+            return
+
+        self.stdout.write(f"Seeding {rows - existing} links...")
+        batch = 100_000
+        links = Link.objects.filter(user=user)
+        last_id = links.aggregate(last_id=Max("pk"))["last_id"] or 0
+        for start in range(existing + 1, rows + 1, batch):
+            stop = min(start + batch - 1, rows)
+            # The raw INSERT skips the Link signals; count the batch into
+            # UserLinkStats / UserLinkDailyStats in the same transaction.
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    SEED_SQL, {"user_id": user.id, "start": start, "stop": stop}
+                )
+                seeded = links.filter(pk__gt=last_id)
+                apply_link_deltas(count_link_types(seeded))
+                last_id = seeded.aggregate(last_id=Max("pk"))["last_id"]
+            self.stdout.write(f"  {stop}/{rows}")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE api_link")
+
+    def cleanup(self, user):
+        # Deleting a million links through the ORM would load every one of
+        # them; delete them in SQL and let the user delete cascade the
+        # counter rows, in one transaction so the counters never disagree.
+        self.stdout.write("Deleting the benchmark user and its links...")
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM api_link WHERE user_id = %s", [user.id])
+            user.delete()
+
+    def measure(self, queryset, repeat, use_indexes):
+        timings = []
+        for _ in range(repeat):
+            with transaction.atomic(), connection.cursor() as cursor:
+                if not use_indexes:
+                    cursor.execute("SET LOCAL enable_bitmapscan = off")
+                    cursor.execute("SET LOCAL enable_indexscan = off")
+                started = time.perf_counter()
+                list(queryset.values_list("id", flat=True))
+                timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,89 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from api.models import Link
+from api.serializers import LinkDetailSerializer, LinkValuesSerializer
+from api.utils import canonical_url_hash, extract_host
+
+User = get_user_model()
+
+BENCH_EMAIL = "serialization-benchmark@example.com"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare LinkDetailSerializer with the values()-based LinkValuesSerializer "
+        "used by list and search responses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--fields",
+            default=",".join(LinkDetailSerializer.Meta.fields),
+            help="Comma-separated fields for the fast path, as in ?fields=.",
+        )
+        parser.add_argument(
+            "--cleanup",
+            action="store_true",
+            help="Delete the benchmark user and its links afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(email=BENCH_EMAIL)
+        self.seed(user, options["rows"])
+
+        links = Link.objects.filter(user=user).defer("search_vector")[: options["rows"]]
+        fields = options["fields"].split(",")
+
+        serializer_ms = self.measure(
+            lambda: LinkDetailSerializer(links, many=True).data, options["repeat"]
+        )
+        values_ms = self.measure(
+            lambda: LinkValuesSerializer(fields).to_representation(
+                links.values(*fields)
+            ),
+            options["repeat"],
+        )
+
+        self.stdout.write(
+            f"{options['rows']} rows | LinkDetailSerializer {serializer_ms:8.1f} ms | "
+            f"values() fast path {values_ms:8.1f} ms | speedup x{serializer_ms / values_ms:.1f}"
+        )
+
+        if options["cleanup"]:
+            user.delete()
+
+    def seed(self, user, rows):
+        existing = Link.objects.filter(user=user).count()
+        if existing >= rows:
+            return
+
+        self.stdout.write(f"Seeding {rows - existing} links...")
+        links = []
+        for i in range(existing, rows):
+            url = f"https://example.com/benchmark/{i}"
+            links.append(
+                Link(
+                    user=user,
+                    url=url,
+                    url_hash=canonical_url_hash(url),
+                    host=extract_host(url),
+                    title=f"Benchmark link {i}",
+                    description="Lorem ipsum dolor sit amet. " * 20,
+                    image="https://example.com/image.png",
+                )
+            )
+        Link.objects.bulk_create(links, batch_size=2000)
+
+    def measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Link
+from api.tasks import enrich_link
+
+
+class Command(BaseCommand):
+    help = (
+        "Fetch Open Graph data for links left in the 'pending' state, "
+        "e.g. after a restart dropped queued background jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--include-errors",
+            action="store_true",
+            help="Also retry links whose previous enrichment failed.",
+        )
+
+    def handle(self, *args, **options):
+        statuses = [Link.ENRICHMENT_PENDING]
+        if options["include_errors"]:
+            statuses.append(Link.ENRICHMENT_ERROR)
+
+        link_ids = Link.objects.filter(enrichment_status__in=statuses).values_list(
+            "id", flat=True
+        )
+
+        processed = 0
+        for link_id in link_ids.iterator():
+            enrich_link(link_id)
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Enriched {processed} links."))
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from api.collection_counters import (
+    counter_values,
+    last_link_created_subquery,
+    link_count_subquery,
+    lock_collections,
+)
+from api.models import Collection
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Collection.link_count and last_link_added_at (the newest member "
+        "link's created_at) from the collection-link join table in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_pk = 0
+        checked = repaired = 0
+
+        while True:
+            pks = list(
+                Collection.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic():
+                # The same row locks as the live recount, so neither overwrites
+                # the other with a stale count.
+                stale = (
+                    lock_collections(pks)
+                    .alias(
+                        actual_count=link_count_subquery(),
+                        newest_link=last_link_created_subquery(),
+                    )
+                    .filter(
+                        ~Q(link_count=F("actual_count"))
+                        | Q(last_link_added_at__isnull=True, newest_link__isnull=False)
+                        | Q(last_link_added_at__isnull=False, newest_link__isnull=True)
+                        | Q(last_link_added_at__lt=F("newest_link"))
+                        | Q(last_link_added_at__gt=F("newest_link"))
+                    )
+                )
+                repaired += stale.update(**counter_values())
+
+            checked += len(pks)
+            last_pk = pks[-1]
+            self.stdout.write(f"Checked {checked} collections, repaired {repaired}.")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Done: {repaired} of {checked} collections repaired.")
+        )
@@ -0,0 +1,130 @@
+import time
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api.link_stats import COLUMNS, count_link_types
+from api.models import Link, UserLinkDailyStats, UserLinkStats
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-user link counters (UserLinkStats) and the daily "
+        "rollups (UserLinkDailyStats) from api_link in batches of users, "
+        "creating missing rows and fixing drifted ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to pause between batches.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report mismatches, do not write.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_pk = 0
+        checked = repaired = 0
+
+        while True:
+            pks = list(
+                User.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic():
+                # Lock the rows so that concurrent link writes wait for the fix
+                # instead of applying their deltas to stale counters.
+                stats = {
+                    row.user_id: row
+                    for row in UserLinkStats.objects.select_for_update().filter(
+                        user_id__in=pks
+                    )
+                }
+                actual = count_link_types(Link.objects.filter(user_id__in=pks))
+                mismatched = self.repair_totals(pks, stats, actual, options["dry_run"])
+                mismatched |= self.repair_daily(pks, actual, options["dry_run"])
+
+            checked += len(pks)
+            repaired += len(mismatched)
+            last_pk = pks[-1]
+            self.stdout.write(f"Checked {checked} users, mismatched {repaired}.")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        verb = "found" if options["dry_run"] else "repaired"
+        self.stdout.write(
+            self.style.SUCCESS(f"Done: {repaired} of {checked} users {verb}.")
+        )
+
+    def repair_totals(self, pks, stats, actual, dry_run):
+        per_user = defaultdict(Counter)
+        for (user_id, _, link_type), count in actual.items():
+            per_user[user_id][link_type] += count
+
+        changed, missing = [], []
+        for pk in pks:
+            counts = per_user[pk]
+            expected = {name: counts.get(name, 0) for name in UserLinkStats.TYPES}
+            expected["total"] = sum(counts.values())
+
+            row = stats.get(pk)
+            if row is None:
+                missing.append(UserLinkStats(user_id=pk, **expected))
+            elif any(getattr(row, name) != expected[name] for name in COLUMNS):
+                for name in COLUMNS:
+                    setattr(row, name, expected[name])
+                row.updated_at = timezone.now()
+                changed.append(row)
+            else:
+                continue
+            self.stdout.write(f"User {pk}: expected totals {expected}")
+
+        if not dry_run:
+            UserLinkStats.objects.bulk_update(changed, [*COLUMNS, "updated_at"])
+            UserLinkStats.objects.bulk_create(missing, ignore_conflicts=True)
+        return {row.user_id for row in changed + missing}
+
+    def repair_daily(self, pks, actual, dry_run):
+        expected = {key: count for key, count in actual.items() if count}
+        changed, stale = [], []
+        for row in UserLinkDailyStats.objects.filter(user_id__in=pks):
+            count = expected.pop((row.user_id, row.day, row.type), 0)
+            if count == row.count:
+                continue
+            if count:
+                row.count = count
+                changed.append(row)
+            elif row.count:
+                stale.append(row)
+        missing = [
+            UserLinkDailyStats(user_id=user_id, day=day, type=link_type, count=count)
+            for (user_id, day, link_type), count in expected.items()
+        ]
+
+        rows = changed + stale + missing
+        for row in rows:
+            self.stdout.write(
+                f"User {row.user_id}: {row.day} {row.type} expected "
+                f"{actual.get((row.user_id, row.day, row.type), 0)}"
+            )
+        if not dry_run:
+            UserLinkDailyStats.objects.bulk_update(changed, ["count"])
+            UserLinkDailyStats.objects.filter(pk__in=[row.pk for row in stale]).delete()
+            UserLinkDailyStats.objects.bulk_create(missing, ignore_conflicts=True)
+        return {row.user_id for row in rows}
@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-17 12:53
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0002_link_enrichment_status'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='collection',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.AlterModelOptions(
+            name='link',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Link', 'verbose_name_plural': 'Links'},
+        ),
+        AddIndexConcurrently(
+            model_name='collection',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='api_collect_user_id_c30965_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='link',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='api_link_user_id_051795_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0 on 2026-10-17 12:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+# Keep in sync with api.search.LINK_SEARCH_VECTOR.
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION api_link_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER api_link_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON api_link
+    FOR EACH ROW EXECUTE FUNCTION api_link_search_vector_update();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS api_link_search_vector_trigger ON api_link;
+DROP FUNCTION IF EXISTS api_link_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0004_link_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='link',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+        AddIndexConcurrently(
+            model_name='link',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='link_search_vector_gin'),
+        ),
+    ]
@@ -0,0 +1,148 @@
+# Generated by Django 5.0 on 2026-10-17 12:58
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+
+
+# A frozen copy of api.utils.canonical_url_hash as of this migration, so that
+# later changes to the live code do not change what the backfill computes.
+def canonical_url_hash(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = (parts.hostname or "").lower()
+    host = host[4:] if host.startswith("www.") else host
+    if parts.port and not (
+        (scheme == "http" and parts.port == 80)
+        or (scheme == "https" and parts.port == 443)
+    ):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if path != "/":
+        path = path.rstrip("/")
+
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not (
+                key.lower().startswith(("utm_", "mc_"))
+                or key.lower() in {"fbclid", "gclid", "yclid"}
+            )
+        )
+    )
+    key = urlunsplit((scheme, host, path, query, ""))
+    key = re.sub(r"^https?://(www\.)?", "", key, flags=re.IGNORECASE)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def backfill_url_hash(apps, schema_editor):
+    Link = apps.get_model("api", "Link")
+
+    # Loop until no NULL is left, which also picks up rows that application
+    # servers still running the previous code insert during the backfill.
+    while True:
+        with transaction.atomic():
+            links = list(
+                Link.objects.filter(url_hash__isnull=True)
+                .order_by("id")
+                .select_for_update(skip_locked=True)
+                .only("id", "user_id", "url")[:BATCH_SIZE]
+            )
+            if not links:
+                break
+
+            for link in links:
+                link.url_hash = canonical_url_hash(link.url)
+            taken = set(
+                Link.objects.filter(
+                    user_id__in={link.user_id for link in links},
+                    url_hash__in={link.url_hash for link in links},
+                ).values_list("user_id", "url_hash")
+            )
+            for link in links:
+                if (link.user_id, link.url_hash) in taken:
+                    # Rows saved before canonicalization may collide (e.g. the
+                    # same page with different utm_* params). Keep them with a
+                    # hash of the raw URL; only new duplicates are rejected.
+                    link.url_hash = hashlib.sha256(
+                        f"raw:{link.id}:{link.url}".encode("utf-8")
+                    ).hexdigest()
+                taken.add((link.user_id, link.url_hash))
+            Link.objects.bulk_update(links, ["url_hash"])
+
+
+class Migration(migrations.Migration):
+    # Each backfill batch commits on its own instead of holding one long
+    # transaction over the whole table, and the indexes are built concurrently.
+    atomic = False
+
+    dependencies = [
+        ('api', '0005_link_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='link',
+            name='url_hash',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_url_hash, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            # SET NOT NULL reuses the validated CHECK constraint instead of
+            # scanning the table under an ACCESS EXCLUSIVE lock.
+            database_operations=[
+                migrations.RunSQL(
+                    [
+                        "ALTER TABLE api_link ADD CONSTRAINT api_link_url_hash_not_null "
+                        "CHECK (url_hash IS NOT NULL) NOT VALID",
+                        "ALTER TABLE api_link VALIDATE CONSTRAINT api_link_url_hash_not_null",
+                        "ALTER TABLE api_link ALTER COLUMN url_hash SET NOT NULL",
+                        "ALTER TABLE api_link DROP CONSTRAINT api_link_url_hash_not_null",
+                    ],
+                    "ALTER TABLE api_link ALTER COLUMN url_hash DROP NOT NULL",
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='link',
+                    name='url_hash',
+                    field=models.CharField(editable=False, max_length=64),
+                ),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    [
+                        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+                        "unique_link_url_per_user ON api_link (user_id, url_hash)",
+                        "ALTER TABLE api_link ADD CONSTRAINT unique_link_url_per_user "
+                        "UNIQUE USING INDEX unique_link_url_per_user",
+                    ],
+                    "ALTER TABLE api_link DROP CONSTRAINT unique_link_url_per_user",
+                ),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='link',
+                    constraint=models.UniqueConstraint(fields=('user', 'url_hash'), name='unique_link_url_per_user'),
+                ),
+            ],
+        ),
+        RemoveIndexConcurrently(
+            model_name='link',
+            name='api_link_url_2d21a9_idx',
+        ),
+        migrations.AlterField(
+            model_name='link',
+            name='url',
+            field=models.URLField(),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-17 13:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0006_link_url_hash'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='collection',
+            index=models.Index(fields=['user', 'updated_at'], name='api_collect_user_id_48b428_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='link',
+            index=models.Index(fields=['user', 'updated_at'], name='api_link_user_id_2c52f8_idx'),
+        ),
+    ]
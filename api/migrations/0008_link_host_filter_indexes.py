@@ -0,0 +1,70 @@
+# Generated by Django 5.0 on 2026-10-17 13:03
+
+from urllib.parse import urlsplit
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+
+
+# A frozen copy of api.utils.extract_host as of this migration, so that later
+# changes to the live code do not change what the backfill computes.
+def extract_host(url):
+    host = (urlsplit(url.strip()).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def backfill_host(apps, schema_editor):
+    Link = apps.get_model("api", "Link")
+
+    # Walk the table in primary key order, one short transaction per batch;
+    # rows inserted meanwhile by the previous code get higher ids.
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            links = list(
+                Link.objects.filter(id__gt=last_id, host="")
+                .order_by("id")
+                .select_for_update()
+                .only("id", "url")[:BATCH_SIZE]
+            )
+            if not links:
+                break
+            for link in links:
+                link.host = extract_host(link.url)
+            Link.objects.bulk_update(links, ["host"])
+        last_id = links[-1].id
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0007_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='link',
+            name='host',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_host, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='link',
+            index=models.Index(fields=['user', 'type', '-created_at', '-id'], name='api_link_user_id_aac745_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='link',
+            index=models.Index(fields=['user', 'host', '-created_at', '-id'], name='api_link_user_id_0aea59_idx'),
+        ),
+        # Superseded by the (user, type, -created_at, -id) index above.
+        RemoveIndexConcurrently(
+            model_name='link',
+            name='api_link_user_id_c2280f_idx',
+        ),
+    ]
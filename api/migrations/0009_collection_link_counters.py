@@ -0,0 +1,72 @@
+# Generated by Django 5.0 on 2026-10-17 13:09
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models, transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 1000
+
+
+def backfill_counters(apps, schema_editor):
+    Collection = apps.get_model("api", "Collection")
+    LinkCollections = Collection.links.through
+
+    memberships = (
+        LinkCollections.objects.filter(collection_id=OuterRef("pk"))
+        .order_by()
+        .values("collection_id")
+    )
+    link_count = Coalesce(
+        Subquery(memberships.annotate(count=Count("*")).values("count")), 0
+    )
+    # The join table has no timestamps; the newest member link is the best
+    # available estimate for collections that existed before this migration.
+    last_link_added_at = Subquery(
+        memberships.annotate(last=Max("link__created_at")).values("last")
+    )
+
+    last_pk = 0
+    while True:
+        pks = list(
+            Collection.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:BATCH_SIZE]
+        )
+        if not pks:
+            break
+        with transaction.atomic():
+            Collection.objects.filter(pk__in=pks).update(
+                link_count=link_count, last_link_added_at=last_link_added_at
+            )
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0008_link_host_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='last_link_added_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='link_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='collection',
+            index=models.Index(fields=['user', '-link_count', '-id'], name='api_collect_user_id_26b13d_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='collection',
+            index=models.Index(models.F('user'), models.OrderBy(models.F('last_link_added_at'), descending=True, nulls_last=True), models.OrderBy(models.F('id'), descending=True), name='collection_last_added_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-17 13:12
+
+from django.db import migrations
+
+# This migration used to create the api_user_link_stats materialized view.
+# 0011 replaced it with the UserLinkStats counter table before the view was
+# ever read, so it is kept empty only to preserve the migration graph.
+# Databases that already applied the old version get the view dropped by 0011.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_collection_link_counters'),
+    ]
+
+    operations = []
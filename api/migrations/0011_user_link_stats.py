@@ -0,0 +1,58 @@
+# Generated by Django 5.0 on 2026-10-17 13:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+INSERT INTO api_userlinkstats (user_id, total, website, book, article, music, video,
+                               object, error, updated_at)
+SELECT u.id,
+       COUNT(l.id),
+       COUNT(*) FILTER (WHERE l.type = 'website'),
+       COUNT(*) FILTER (WHERE l.type = 'book'),
+       COUNT(*) FILTER (WHERE l.type = 'article'),
+       COUNT(*) FILTER (WHERE l.type = 'music'),
+       COUNT(*) FILTER (WHERE l.type = 'video'),
+       COUNT(*) FILTER (WHERE l.type = 'object'),
+       COUNT(*) FILTER (WHERE l.type = 'error'),
+       now()
+FROM api_customuser AS u
+         LEFT JOIN api_link AS l ON u.id = l.user_id
+GROUP BY u.id;
+"""
+
+# The counters replace the materialized view an earlier version of 0010 created.
+DROP_VIEW_SQL = "DROP MATERIALIZED VIEW IF EXISTS api_user_link_stats;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_user_link_stats_materialized_view'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserLinkStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='link_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0)),
+                ('website', models.IntegerField(default=0)),
+                ('book', models.IntegerField(default=0)),
+                ('article', models.IntegerField(default=0)),
+                ('music', models.IntegerField(default=0)),
+                ('video', models.IntegerField(default=0)),
+                ('object', models.IntegerField(default=0)),
+                ('error', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'User Link Stats',
+                'verbose_name_plural': 'User Link Stats',
+                'indexes': [models.Index(fields=['-total'], name='api_userlin_total_34afbc_idx')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(DROP_VIEW_SQL, migrations.RunSQL.noop),
+    ]
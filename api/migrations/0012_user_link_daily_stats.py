@@ -0,0 +1,44 @@
+# Generated by Django 5.0 on 2026-10-17 13:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+INSERT INTO api_userlinkdailystats (user_id, day, type, count)
+SELECT user_id, (created_at AT TIME ZONE %s)::date, type, COUNT(*)
+FROM api_link
+GROUP BY 1, 2, 3;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_user_link_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserLinkDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('type', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_link_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Link Daily Stats',
+                'verbose_name_plural': 'User Link Daily Stats',
+                'indexes': [models.Index(fields=['type', 'day'], include=('user', 'count'), name='userlinkdaily_type_day_idx'), models.Index(fields=['day'], include=('user', 'count'), name='userlinkdaily_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='userlinkdailystats',
+            constraint=models.UniqueConstraint(fields=('user', 'day', 'type'), name='userlinkdailystats_unique'),
+        ),
+        migrations.RunSQL(
+            [(BACKFILL_SQL, [settings.TIME_ZONE])], migrations.RunSQL.noop
+        ),
+    ]
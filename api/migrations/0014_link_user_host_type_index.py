@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-17 13:37
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('api', '0013_report_job'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='link',
+            index=models.Index(fields=['user', 'host', 'type'], name='api_link_user_id_3711ac_idx'),
+        ),
+    ]
@@ -3,7 +3,11 @@ from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Upper
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -55,40 +59,226 @@ class Link(models.Model):
         ("video", "Video"),
     ]
 
+    ENRICHMENT_PENDING = "pending"
+    ENRICHMENT_READY = "ready"
+    ENRICHMENT_ERROR = "error"
+    ENRICHMENT_STATUS_CHOICES = [
+        (ENRICHMENT_PENDING, "Pending"),
+        (ENRICHMENT_READY, "Ready"),
+        (ENRICHMENT_ERROR, "Error"),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="links")
-    url = models.URLField(unique=True)
+    url = models.URLField()
+    # SHA-256 of the canonical URL, see api.utils.canonical_url_hash.
+    url_hash = models.CharField(max_length=64, editable=False)
+    # Lowercased host name without "www.", see api.utils.extract_host.
+    host = models.CharField(max_length=255, blank=True, default="", editable=False)
     title = models.CharField(max_length=255, blank=True)
     description = models.TextField(blank=True, null=True)
     image = models.URLField(blank=True, null=True)
     type = models.CharField(max_length=50, choices=TYPE_CHOICES, default="website")
+    enrichment_status = models.CharField(
+        max_length=10, choices=ENRICHMENT_STATUS_CHOICES, default=ENRICHMENT_READY
+    )
+    # Maintained by the api_link_search_vector_trigger database trigger.
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         indexes = [
-            models.Index(fields=["user", "type"]),
-            models.Index(fields=["url"]),
+            # Link filters (api.filters.LinkFilter) combined with the default
+            # newest-first ordering; created_at ranges use the next index.
+            models.Index(fields=["user", "type", "-created_at", "-id"]),
+            models.Index(fields=["user", "host", "-created_at", "-id"]),
+            # host and type filters combined.
+            models.Index(fields=["user", "host", "type"]),
+            models.Index(fields=["user", "-created_at", "-id"]),
+            # Conditional GET validators: max(updated_at) and count per user.
+            models.Index(fields=["user", "updated_at"]),
+            # Serve UPPER(...) LIKE '%..%' / = lookups (icontains, iexact) and
+            # the trigram similarity operator used by the link search.
+            GinIndex(
+                OpClass(Upper("url"), name="gin_trgm_ops"),
+                name="link_url_upper_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("title"), name="gin_trgm_ops"),
+                name="link_title_upper_trgm",
+            ),
+            GinIndex(fields=["search_vector"], name="link_search_vector_gin"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "url_hash"], name="unique_link_url_per_user"
+            ),
         ]
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
         verbose_name = "Link"
         verbose_name_plural = "Links"
 
     def __str__(self):
         return self.title or self.url
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Read __dict__ so that a deferred url does not trigger a query.
+        instance._loaded_url = instance.__dict__.get("url")
+        return instance
+
+    def save(self, *args, **kwargs):
+        from api.utils import canonical_url_hash, extract_host
+
+        # Only hash a new or changed URL: rows that collided when url_hash was
+        # introduced keep the fallback hash of migration 0006 until then.
+        url = self.__dict__.get("url")
+        if url is not None and (
+            not self.url_hash or url != getattr(self, "_loaded_url", None)
+        ):
+            self.url_hash = canonical_url_hash(url)
+            self.host = extract_host(url)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "url" in update_fields:
+                kwargs["update_fields"] = {*update_fields, "url_hash", "host"}
+        # The post_save receivers in api.signals update the link counters;
+        # commit them together with the row.
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+        self._loaded_url = self.__dict__.get("url")
+
 
 class Collection(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="collections")
     title = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     links = models.ManyToManyField("Link", related_name="collections")
+    # Maintained by api.signals on membership changes and link deletion.
+    link_count = models.PositiveIntegerField(default=0, editable=False)
+    # created_at of the newest member link, see api.collection_counters.
+    last_link_added_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"]),
+            models.Index(fields=["user", "updated_at"]),
+            # Ordering of the collection list (api.filters.NullsLastOrderingFilter).
+            models.Index(fields=["user", "-link_count", "-id"]),
+            models.Index(
+                F("user"),
+                F("last_link_added_at").desc(nulls_last=True),
+                F("id").desc(),
+                name="collection_last_added_idx",
+            ),
+        ]
+        ordering = ["-created_at", "-id"]
+
     def __str__(self):
         return self.title
 
 
+class UserLinkStats(models.Model):
+    """Per-user link counters, maintained on write by api.link_stats."""
+
+    # Link.TYPE_CHOICES plus the "object" and "error" types set by enrichment.
+    TYPES = [value for value, _ in Link.TYPE_CHOICES] + ["object", "error"]
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="link_stats"
+    )
+    total = models.IntegerField(default=0)
+    website = models.IntegerField(default=0)
+    book = models.IntegerField(default=0)
+    article = models.IntegerField(default=0)
+    music = models.IntegerField(default=0)
+    video = models.IntegerField(default=0)
+    object = models.IntegerField(default=0)
+    error = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-total"]),
+        ]
+        verbose_name = "User Link Stats"
+        verbose_name_plural = "User Link Stats"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.total} links"
+
+
+class UserLinkDailyStats(models.Model):
+    """Links added per user, day (of Link.created_at) and type; maintained by api.link_stats."""
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="daily_link_stats"
+    )
+    day = models.DateField()
+    type = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "day", "type"], name="userlinkdailystats_unique"
+            ),
+        ]
+        indexes = [
+            # Leaderboard windows: WHERE day >= ... [AND type = ...] GROUP BY user.
+            models.Index(
+                fields=["type", "day"],
+                include=["user", "count"],
+                name="userlinkdaily_type_day_idx",
+            ),
+            models.Index(
+                fields=["day"], include=["user", "count"], name="userlinkdaily_day_idx"
+            ),
+        ]
+        verbose_name = "User Link Daily Stats"
+        verbose_name_plural = "User Link Daily Stats"
+
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.type}: {self.count}"
+
+
+class ReportJob(models.Model):
+    """An asynchronously generated CSV report, see api.reports."""
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="report_jobs")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    # Relative to settings.REPORTS_DIR; every job writes its own file.
+    file_name = models.CharField(max_length=255, blank=True, editable=False)
+    row_count = models.IntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Report {self.pk} ({self.status})"
+
+
 class PasswordResetCode(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="reset_codes")
     code = models.UUIDField(default=uuid.uuid4, unique=True)
@@ -0,0 +1,148 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from api.utils import canonicalize_url, fetch_og_data
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def record_hit(self, negative=False):
+        with self._lock:
+            self.hits += 1
+            if negative:
+                self.negative_hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def as_dict(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class InMemoryOGCache:
+    """Per-process LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class DjangoOGCache:
+    """Stores entries in a Django cache alias so they are shared between workers.
+
+    Eviction beyond the TTL is left to the configured cache backend.
+    """
+
+    key_prefix = "og-data"
+
+    def __init__(self, ttl, max_entries, alias=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache = caches[alias or settings.OG_CACHE_ALIAS]
+
+    def make_key(self, key):
+        return f"{self.key_prefix}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    def get(self, key):
+        return self.cache.get(self.make_key(key))
+
+    def set(self, key, value, ttl=None):
+        self.cache.set(self.make_key(key), value, self.ttl if ttl is None else ttl)
+
+
+stats = CacheStats()
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_og_cache():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_class = import_string(settings.OG_CACHE_BACKEND)
+                _backend = backend_class(
+                    ttl=settings.OG_CACHE_TTL,
+                    max_entries=settings.OG_CACHE_MAX_ENTRIES,
+                )
+    return _backend
+
+
+def get_og_data(url):
+    cache = get_og_cache()
+    key = canonicalize_url(url)
+
+    og_data = cache.get(key)
+    if og_data is not None:
+        stats.record_hit(negative=og_data.get("type") == "error")
+        return og_data
+
+    stats.record_miss()
+    og_data = fetch_og_data(url)
+    if og_data.get("type") == "error":
+        cache.set(key, og_data, ttl=settings.OG_NEGATIVE_CACHE_TTL)
+    else:
+        cache.set(key, og_data)
+    return og_data
+
+
+def get_cache_stats():
+    cache = get_og_cache()
+    data = stats.as_dict()
+    data["backend"] = settings.OG_CACHE_BACKEND
+    data["ttl"] = settings.OG_CACHE_TTL
+    data["negative_ttl"] = settings.OG_NEGATIVE_CACHE_TTL
+    data["max_entries"] = settings.OG_CACHE_MAX_ENTRIES
+    if isinstance(cache, InMemoryOGCache):
+        data["size"] = len(cache)
+    return data
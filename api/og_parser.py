@@ -0,0 +1,125 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from itertools import chain
+
+from bs4 import BeautifulSoup
+
+OG_PROPERTIES = ("og:type", "og:title", "og:description", "og:image")
+
+# The HTML spec looks for a <meta charset> / http-equiv declaration in the
+# first 1024 bytes; the regex matches both forms.
+SNIFF_BYTES = 1024
+META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]*?charset\s*=\s*["']?\s*([a-z0-9_.:-]+)""", re.IGNORECASE
+)
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class HeadMetaParser(HTMLParser):
+    """Collects ``og:*`` properties, ``name=description`` and ``<title>`` in one pass.
+
+    Only the first value of each key is kept, matching ``soup.find``. Parsing is
+    finished once ``</head>`` or ``<body>`` is seen.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.done = False
+        self._title_parts = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+
+        if tag == "meta":
+            attrs = dict(attrs)
+            content = attrs.get("content")
+            prop = attrs.get("property")
+            if prop and prop.startswith("og:"):
+                self.meta.setdefault(prop, content)
+            elif attrs.get("name") == "description":
+                self.meta.setdefault("description", content)
+        elif tag == "title" and "title" not in self.meta:
+            self._title_parts = []
+        elif tag == "body":
+            self.done = True
+
+    def handle_data(self, data):
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title_parts is not None:
+            self.meta["title"] = "".join(self._title_parts)
+            self._title_parts = None
+        elif tag == "head":
+            self.done = True
+
+
+def get_decoder(encoding):
+    try:
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+def sniff_encoding(head, encoding=None):
+    """Pick the encoding like a browser: BOM, then HTTP charset, then ``<meta>``."""
+    for bom, bom_encoding in BOMS:
+        if head.startswith(bom):
+            return bom_encoding
+    if encoding:
+        return encoding
+    match = META_CHARSET_RE.search(head[:SNIFF_BYTES])
+    if not match:
+        return None
+    declared = match.group(1).decode("ascii").lower()
+    # A UTF-16 declaration in ASCII-compatible bytes is wrong by definition.
+    return "utf-8" if declared.startswith("utf-16") else declared
+
+
+def parse_head_meta(chunks, max_bytes, encoding=None):
+    parser = HeadMetaParser()
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= SNIFF_BYTES:
+            break
+    decoder = get_decoder(sniff_encoding(head, encoding))
+    read = 0
+
+    for chunk in chain([head], chunks):
+        if not chunk:
+            continue
+        read += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done or read >= max_bytes:
+            break
+
+    return parser.meta
+
+
+def parse_meta_bs4(content):
+    soup = BeautifulSoup(content, "html.parser")
+    meta = {}
+
+    for prop in OG_PROPERTIES:
+        tag = soup.find("meta", property=prop)
+        if tag:
+            meta[prop] = tag.get("content")
+
+    description = soup.find("meta", attrs={"name": "description"})
+    if description:
+        meta["description"] = description.get("content")
+
+    if soup.title:
+        meta["title"] = soup.title.string
+
+    return meta
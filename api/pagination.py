@@ -0,0 +1,28 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    ordering = ("-created_at", "-id")
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class RankedPageNumberPagination(PageNumberPagination):
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class CollectionLinksCursorPagination(CursorPagination):
+    # Keyset over the (collection_id, link_id) unique index of the join
+    # table. Link IDs grow with created_at, so this is newest first too.
+    ordering = ("-link_id",)
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        # The collection view's ordering filter applies to collections only.
+        return self.ordering
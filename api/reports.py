@@ -0,0 +1,186 @@
+import csv
+import logging
+import os
+import tempfile
+import zlib
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.link_export import Echo, format_csv_value
+from api.models import ReportJob
+from api.tasks import run_in_background
+from api.utils import save_to_csv
+
+logger = logging.getLogger("api")
+
+TOP_USERS_COLUMNS = [
+    "email",
+    "count_links",
+    "website",
+    "book",
+    "article",
+    "music",
+    "video",
+    "object",
+    "error",
+]
+
+BREAKDOWN_COLUMNS = ["id", "email", "date_joined", *TOP_USERS_COLUMNS[1:]]
+
+
+@lru_cache(maxsize=None)
+def load_sql(name):
+    """Read ``<BASE_DIR>/<name>.sql`` once per process."""
+    with open(settings.BASE_DIR / f"{name}.sql", "r") as file:
+        return file.read().strip().rstrip(";")
+
+
+def fetch_top_users():
+    with connection.cursor() as cursor:
+        cursor.execute(load_sql("top_users"))
+        rows = cursor.fetchall()
+    return [dict(zip(TOP_USERS_COLUMNS, row)) for row in rows]
+
+
+def enqueue_report(user):
+    """Create a top users report job for ``user``, or return the one in progress."""
+    now = timezone.now()
+    with transaction.atomic():
+        # Serialise concurrent requests of the same user on the user row.
+        get_user_model().objects.select_for_update().only("pk").get(pk=user.pk)
+        in_progress = ReportJob.objects.filter(
+            user=user, status__in=[ReportJob.STATUS_PENDING, ReportJob.STATUS_RUNNING]
+        )
+        # A job lost with its worker process must not block new ones forever.
+        in_progress.filter(
+            updated_at__lt=now - timedelta(seconds=settings.REPORT_JOB_TIMEOUT)
+        ).update(
+            status=ReportJob.STATUS_FAILED,
+            error="Timed out.",
+            finished_at=now,
+            updated_at=now,
+        )
+        job = in_progress.first()
+        if job is None:
+            job = ReportJob.objects.create(user=user)
+            transaction.on_commit(lambda: run_in_background(generate_report, job.pk))
+    return job
+
+
+def report_path(job):
+    return settings.REPORTS_DIR / job.file_name
+
+
+def generate_report(job_id):
+    updated = ReportJob.objects.filter(
+        pk=job_id, status=ReportJob.STATUS_PENDING
+    ).update(status=ReportJob.STATUS_RUNNING, updated_at=timezone.now())
+    if not updated:
+        return
+    job = ReportJob.objects.get(pk=job_id)
+
+    try:
+        rows = fetch_top_users()
+        job.file_name = f"top_users-{job.pk}-{timezone.now():%Y%m%d%H%M%S}.csv"
+        write_atomically(rows, report_path(job))
+    except Exception as e:
+        logger.error(f"Report {job.pk} failed: {e}")
+        job.status = ReportJob.STATUS_FAILED
+        job.error = str(e)
+        job.file_name = ""
+    else:
+        job.status = ReportJob.STATUS_DONE
+        job.row_count = len(rows)
+    job.finished_at = timezone.now()
+    job.save()
+
+    if job.status == ReportJob.STATUS_DONE:
+        prune_reports(job.user_id)
+
+
+@contextmanager
+def atomic_file(path):
+    """Yield a temp file path next to ``path``; rename it into place on success.
+
+    Readers see either no file or the complete one, never a partial write.
+    """
+    os.makedirs(path.parent, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_atomically(rows, path):
+    with atomic_file(path) as tmp_path:
+        save_to_csv(rows, tmp_path)
+
+
+def prune_reports(user_id):
+    """Keep the newest ``REPORT_JOBS_KEEP`` finished jobs of a user."""
+    finished = ReportJob.objects.filter(
+        user_id=user_id, status__in=[ReportJob.STATUS_DONE, ReportJob.STATUS_FAILED]
+    ).order_by("-created_at", "-id")
+    stale = list(finished[settings.REPORT_JOBS_KEEP :])
+    for job in stale:
+        if job.file_name:
+            try:
+                os.unlink(report_path(job))
+            except FileNotFoundError:
+                pass
+    ReportJob.objects.filter(pk__in=[job.pk for job in stale]).delete()
+
+
+def iter_user_breakdown(chunk_size=None, progress=None):
+    """Yield the breakdown rows of every user, a list of ``chunk_size`` at a time.
+
+    The rows come from a server-side cursor opened inside a transaction. In
+    autocommit mode the cursor would be declared WITH HOLD, and PostgreSQL
+    materializes the whole result set of such a cursor before the first fetch.
+    ``progress(exported)`` is called after each chunk.
+    """
+    chunk_size = chunk_size or settings.USER_BREAKDOWN_CHUNK_SIZE
+    exported = 0
+    with transaction.atomic(), connection.chunked_cursor() as cursor:
+        cursor.execute(load_sql("user_breakdown"))
+        while rows := cursor.fetchmany(chunk_size):
+            yield rows
+            exported += len(rows)
+            if progress:
+                progress(exported)
+
+
+def iter_breakdown_csv(chunks):
+    """CSV text of the breakdown, one string per chunk of rows."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(BREAKDOWN_COLUMNS)
+    for rows in chunks:
+        yield "".join(
+            writer.writerow([format_csv_value(value) for value in row]) for row in rows
+        )
+
+
+def iter_gzip(chunks):
+    """Gzip a stream of byte strings on the fly."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
+
+
+def iter_breakdown_export(use_gzip=False, chunk_size=None, progress=None):
+    """Byte chunks of the breakdown CSV, gzipped if ``use_gzip``."""
+    chunks = iter_user_breakdown(chunk_size, progress)
+    content = (text.encode("utf-8") for text in iter_breakdown_csv(chunks))
+    return iter_gzip(content) if use_gzip else content
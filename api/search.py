@@ -0,0 +1,53 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Upper
+
+from api.utils import extract_uri
+
+SEARCH_CONFIG = "english"
+
+# Same expression as the api_link_search_vector_trigger (migration 0005).
+LINK_SEARCH_VECTOR = SearchVector(
+    "title", weight="A", config=SEARCH_CONFIG
+) + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+
+
+def substring_search(queryset, query):
+    # iexact/icontains compile to UPPER(column) = / LIKE UPPER(%s), which is
+    # exactly the expression covered by the trigram GIN indexes on Link.
+    return queryset.filter(
+        Q(title__iexact=query) | Q(url__icontains=extract_uri(query))
+    )
+
+
+def similarity_search(queryset, query):
+    title_query = query.upper()
+    url_query = extract_uri(query).upper()
+    return (
+        queryset.alias(title_upper=Upper("title"), url_upper=Upper("url"))
+        .filter(
+            Q(title_upper__trigram_similar=title_query)
+            | Q(url_upper__trigram_similar=url_query)
+        )
+        .annotate(
+            similarity=Greatest(
+                TrigramSimilarity("title_upper", title_query),
+                TrigramSimilarity("url_upper", url_query),
+            )
+        )
+        .order_by("-similarity", "-created_at", "-id")
+    )
+
+
+def full_text_search(queryset, query):
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    return (
+        queryset.filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-created_at", "-id")
+    )
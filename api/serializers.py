@@ -1,13 +1,22 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from djoser.serializers import (
     UserCreateSerializer,
 )
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.reverse import reverse
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
-from .models import Collection, Link, PasswordResetCode
-from .utils import generate_reset_code, send_password_reset_email
+from .filters import LinkFilter
+from .leaderboard import WINDOWS, decode_cursor
+from .models import Collection, Link, PasswordResetCode, ReportJob, UserLinkStats
+from .utils import (
+    canonical_url_hash,
+    generate_reset_code,
+    send_password_reset_email,
+)
 
 User = get_user_model()
 
@@ -28,18 +37,136 @@ class LinkDetailSerializer(serializers.ModelSerializer):
             "description",
             "image",
             "type",
+            "enrichment_status",
             "created_at",
             "updated_at",
         ]
+        read_only_fields = ["enrichment_status"]
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def validate_url(self, value):
+        request = self.context.get("request")
+        if self.instance is None or request is None or value == self.instance.url:
+            return value
+
+        duplicates = Link.objects.filter(
+            user=request.user, url_hash=canonical_url_hash(value)
+        ).exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError("You have already added this link.")
+        return value
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            # Another request saved the same URL after validate_url() checked.
+            raise ValidationError({"url": ["You have already added this link."]})
+
+
+class LinkValuesSerializer:
+    """Read-only counterpart of ``LinkDetailSerializer`` for ``values()`` rows.
+
+    Builds the output dicts directly, converting only the fields whose
+    representation differs from the database value.
+    """
+
+    def __init__(self, fields):
+        detail_fields = LinkDetailSerializer().fields
+        self.converters = [
+            (
+                name,
+                (
+                    detail_fields[name].to_representation
+                    if isinstance(detail_fields[name], serializers.DateTimeField)
+                    else None
+                ),
+            )
+            for name in fields
+        ]
+
+    def to_representation(self, rows):
+        data = []
+        for row in rows:
+            item = {}
+            for name, convert in self.converters:
+                value = row[name]
+                item[name] = convert(value) if convert and value is not None else value
+            data.append(item)
+        return data
+
+
+class LinkBulkSelectionSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=settings.LINK_BULK_MAX_IDS,
+        help_text="IDs of the links to change",
+    )
+    filter = serializers.DictField(
+        required=False,
+        help_text="Link filters, as accepted by the list endpoint, e.g. {\"type\": \"video\"}",
+    )
+
+    def validate_filter(self, value):
+        unknown = sorted(set(value) - set(LinkFilter.base_filters))
+        if unknown:
+            raise ValidationError(f"Unknown filters: {', '.join(unknown)}.")
+        return value
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise ValidationError("Provide either 'ids' or 'filter'.")
+        if "filter" in attrs and not attrs["filter"]:
+            raise ValidationError({"filter": "At least one filter is required."})
+        return attrs
+
+
+class LinkBulkValuesSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Link
+        fields = ["title", "description", "image", "type"]
+        extra_kwargs = {"title": {"required": False}}
+
+    def validate(self, attrs):
+        if not attrs:
+            raise ValidationError("At least one field to update is required.")
+        return attrs
+
+
+class LinkBulkUpdateSerializer(LinkBulkSelectionSerializer):
+    values = LinkBulkValuesSerializer()
+
+
+def validate_owned_link_ids(user, value):
+    link_ids = set(value)
+    owned = set(
+        Link.objects.filter(user_id=user.id, pk__in=link_ids).values_list(
+            "pk", flat=True
+        )
+    )
+    invalid_links = sorted(link_ids - owned)
+    if invalid_links:
+        raise serializers.ValidationError(
+            f"Links with IDs {invalid_links} do not belong to the current user."
+        )
+    return link_ids
 
 
 class CollectionDetailSerializer(serializers.ModelSerializer):
     links = LinkDetailSerializer(many=True, read_only=True)
-    link_ids = serializers.PrimaryKeyRelatedField(
-        queryset=Link.objects.all(),
+    link_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
         write_only=True,
-        many=True,
-        source="links"
+        required=False,
     )
 
     class Meta:
@@ -50,42 +177,106 @@ class CollectionDetailSerializer(serializers.ModelSerializer):
             "description",
             "links",
             "link_ids",
+            "link_count",
+            "last_link_added_at",
             "created_at",
             "updated_at",
         ]
 
     def validate_link_ids(self, value):
-        user = self.context['request'].user
-        invalid_links = [link.id for link in value if link.user != user]
-        if invalid_links:
-            raise serializers.ValidationError(
-                f"Links with IDs {invalid_links} do not belong to the current user."
-            )
-        return value
+        return validate_owned_link_ids(self.context['request'].user, value)
 
     def create(self, validated_data):
         user = self.context['request'].user
         validated_data['user'] = user
-        links = validated_data.pop('links', [])
-        collection = Collection.objects.create(**validated_data)
-        collection.links.set(links)
+        link_ids = validated_data.pop('link_ids', set())
+        with transaction.atomic():
+            collection = Collection.objects.create(**validated_data)
+            if link_ids:
+                collection.links.add(*link_ids)
+                collection.refresh_from_db(fields=["link_count", "last_link_added_at"])
         return collection
 
     def update(self, instance, validated_data):
-        links = validated_data.pop('links', [])
+        link_ids = validated_data.pop('link_ids', None)
         instance.title = validated_data.get('title', instance.title)
         instance.description = validated_data.get('description', instance.description)
-        instance.save()
+        with transaction.atomic():
+            # Leave link_count / last_link_added_at to the membership signals.
+            instance.save(update_fields=["title", "description", "updated_at"])
+
+            # Without 'link_ids' (e.g. a PATCH of the title) membership is
+            # kept; otherwise only the changed join rows are written.
+            if link_ids is not None:
+                current = set(instance.links.values_list("pk", flat=True))
+                if current - link_ids:
+                    instance.links.remove(*(current - link_ids))
+                if link_ids - current:
+                    instance.links.add(*(link_ids - current))
+                instance.refresh_from_db(fields=["link_count", "last_link_added_at"])
+        return instance
 
-        user = self.context['request'].user
-        for link in links:
-            if link.user != user:
-                raise serializers.ValidationError(
-                    f"Link with ID {link.id} does not belong to the current user."
-                )
 
-        instance.links.set(links)
-        return instance
+class CollectionSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Collection
+        fields = [
+            "id",
+            "title",
+            "description",
+            "link_count",
+            "last_link_added_at",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class CollectionLinksSerializer(serializers.Serializer):
+    link_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.LINK_BULK_MAX_IDS,
+    )
+
+    def validate_link_ids(self, value):
+        return validate_owned_link_ids(self.context['request'].user, value)
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+    type = serializers.ChoiceField(choices=UserLinkStats.TYPES, required=False)
+    window = serializers.ChoiceField(choices=WINDOWS, default=30)
+    cursor = serializers.CharField(required=False)
+
+    def validate_cursor(self, value):
+        try:
+            return decode_cursor(value)
+        except ValueError as exc:
+            raise ValidationError(str(exc))
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            "id",
+            "status",
+            "row_count",
+            "error",
+            "created_at",
+            "finished_at",
+            "download_url",
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.STATUS_DONE:
+            return None
+        return reverse(
+            "report-download", args=[obj.pk], request=self.context.get("request")
+        )
 
 
 class CustomUserCreateSerializer(UserCreateSerializer):
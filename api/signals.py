@@ -0,0 +1,140 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from api.collection_counters import LinkCollections, recount_collections
+from api.link_stats import apply_link_deltas, count_link_types, record_link_changes
+from api.models import Link, UserLinkStats
+
+User = get_user_model()
+
+
+@receiver(m2m_changed, sender=LinkCollections)
+def update_collection_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        # link.collections.clear(): remember the collections before the rows go.
+        instance._cleared_collection_ids = list(
+            instance.collections.values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if action != "post_clear" and not pk_set:
+        return
+
+    if not reverse:
+        collection_ids = [instance.pk]
+    elif action == "post_clear":
+        collection_ids = getattr(instance, "_cleared_collection_ids", [])
+    else:
+        collection_ids = pk_set
+
+    recount_collections(collection_ids)
+
+
+def updates_link_counters(origin):
+    """Whether the origin of a Link delete updates counters and collections itself.
+
+    That is deleting a user (or a user queryset), see below, or a Link
+    queryset flagged by api.link_bulk.bulk_delete_links.
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model is User or getattr(origin, "updates_link_counters", False)
+    return isinstance(origin, User)
+
+
+@receiver(pre_delete, sender=Link)
+def remember_link_collections(sender, instance, origin=None, **kwargs):
+    if updates_link_counters(origin):
+        return
+    instance._deleted_collection_ids = list(
+        LinkCollections.objects.filter(link_id=instance.pk).values_list(
+            "collection_id", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=Link)
+def update_collections_of_deleted_link(sender, instance, origin=None, **kwargs):
+    if updates_link_counters(origin):
+        return
+    recount_collections(getattr(instance, "_deleted_collection_ids", []))
+
+
+@receiver(post_init, sender=Link)
+def remember_link_type(sender, instance, **kwargs):
+    # Read __dict__ so that a deferred type does not trigger a query.
+    instance._stats_type = instance.__dict__.get("type")
+
+
+@receiver(pre_save, sender=Link)
+def load_deferred_link_type(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or instance._stats_type is not None:
+        return
+    if update_fields is not None and "type" not in update_fields:
+        return
+    instance._stats_type = (
+        Link.objects.filter(pk=instance.pk).values_list("type", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Link)
+def update_link_stats_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        record_link_changes(instance, new_type=instance.type)
+    elif update_fields is None or "type" in update_fields:
+        if instance.type != instance._stats_type:
+            record_link_changes(instance, instance._stats_type, instance.type)
+    instance._stats_type = instance.type
+
+
+@receiver(pre_delete, sender=Link)
+def load_link_type_before_delete(sender, instance, origin=None, **kwargs):
+    if updates_link_counters(origin):
+        return
+    fields = ("user_id", "type", "created_at")
+    deferred = [name for name in fields if name not in instance.__dict__]
+    if deferred:
+        instance.refresh_from_db(fields=deferred)
+
+
+@receiver(post_delete, sender=Link)
+def update_link_stats_on_delete(sender, instance, origin=None, **kwargs):
+    if updates_link_counters(origin):
+        return
+    record_link_changes(instance, old_type=instance.type)
+
+
+@receiver(pre_delete, sender=User)
+def remove_links_of_deleted_user(sender, instance, **kwargs):
+    # The links cascade with the user; the per-link receivers above skip them,
+    # so the counters and collections are updated once per user instead.
+    links = Link.objects.filter(user=instance)
+    apply_link_deltas(count_link_types(links, sign=-1))
+    instance._deleted_collection_ids = list(
+        LinkCollections.objects.filter(link__user=instance)
+        .exclude(collection__user=instance)
+        .values_list("collection_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_delete, sender=User)
+def update_collections_of_deleted_user(sender, instance, **kwargs):
+    recount_collections(getattr(instance, "_deleted_collection_ids", []))
+
+
+@receiver(post_save, sender=User)
+def create_user_link_stats(sender, instance, created, **kwargs):
+    if created:
+        UserLinkStats.objects.bulk_create(
+            [UserLinkStats(user=instance)], ignore_conflicts=True
+        )
@@ -0,0 +1,164 @@
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from api.host_guard import HostUnavailable
+from api.models import Link
+from api.og_cache import get_og_data
+
+logger = logging.getLogger("api")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_delayed = []
+_delayed_ids = count()
+_delayed_condition = threading.Condition()
+_delayed_thread = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.LINK_ENRICHMENT_WORKERS,
+                    thread_name_prefix="link-enrichment",
+                )
+    return _executor
+
+
+def run_in_background(func, *args, **kwargs):
+    def _run():
+        close_old_connections()
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background task {func.__name__} failed: {e}")
+        finally:
+            close_old_connections()
+
+    return get_executor().submit(_run)
+
+
+def run_later(delay, func, *args):
+    """Call ``func(*args)`` after ``delay`` seconds, on one shared timer thread.
+
+    ``func`` runs on the timer thread itself, so it must only hand work off,
+    e.g. to run_in_background.
+    """
+    global _delayed_thread
+    with _delayed_condition:
+        heapq.heappush(
+            _delayed, (time.monotonic() + delay, next(_delayed_ids), func, args)
+        )
+        if _delayed_thread is None:
+            _delayed_thread = threading.Thread(
+                target=_run_delayed, name="link-enrichment-timer", daemon=True
+            )
+            _delayed_thread.start()
+        _delayed_condition.notify()
+
+
+def _run_delayed():
+    while True:
+        with _delayed_condition:
+            while not _delayed or _delayed[0][0] > time.monotonic():
+                timeout = _delayed[0][0] - time.monotonic() if _delayed else None
+                _delayed_condition.wait(timeout)
+            _, _, func, args = heapq.heappop(_delayed)
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"Delayed task {func.__name__} failed: {e}")
+
+
+def fetch_og_data_or_none(url):
+    """Open Graph data for ``url``, or None while its host is unavailable."""
+    try:
+        return get_og_data(url)
+    except HostUnavailable as e:
+        logger.info(f"Deferring Open Graph fetch for {url}: {e}")
+        return None
+
+
+def apply_og_data(link, og_data):
+    if og_data is None:
+        # Left pending for a later retry (see enrich_pending_links).
+        link.enrichment_status = Link.ENRICHMENT_PENDING
+        return
+    link.title = og_data.get("title", "")
+    link.description = og_data.get("description", "")
+    link.image = og_data.get("image", "")
+    link.type = og_data.get("type", link.type)
+    if og_data.get("type") == "error":
+        link.enrichment_status = Link.ENRICHMENT_ERROR
+    else:
+        link.enrichment_status = Link.ENRICHMENT_READY
+
+
+def enrich_link(link_id):
+    """Fetch and save the Open Graph data of a link.
+
+    Returns False if the link's host is unavailable; the link stays pending.
+    """
+    link = Link.objects.filter(pk=link_id).first()
+    if link is None:
+        logger.info(f"Link {link_id} was deleted before enrichment")
+        return True
+
+    og_data = fetch_og_data_or_none(link.url)
+    if og_data is None:
+        return False
+
+    with transaction.atomic():
+        # Re-read under a row lock: the link may have been edited or deleted
+        # while the metadata was fetched, and the type counters are moved
+        # from the type it has now.
+        link = Link.objects.select_for_update().filter(pk=link_id).first()
+        if link is None:
+            logger.info(f"Link {link_id} was deleted before enrichment")
+            return True
+        apply_og_data(link, og_data)
+        link.save(
+            update_fields=[
+                "title",
+                "description",
+                "image",
+                "type",
+                "enrichment_status",
+                "updated_at",
+            ]
+        )
+    return True
+
+
+def enrich_link_or_retry(link_id, attempt):
+    if not enrich_link(link_id):
+        retry_link_enrichment(link_id, attempt)
+
+
+def enqueue_link_enrichment(link_id, attempt=1):
+    return run_in_background(enrich_link_or_retry, link_id, attempt)
+
+
+def retry_link_enrichment(link_id, attempts=1):
+    """Enqueue a link whose host was unavailable again, after ``attempts`` tries.
+
+    The retry waits for the circuit breaker cooldown (longer with every
+    attempt), since an earlier one would be short-circuited too. After
+    LINK_ENRICHMENT_MAX_ATTEMPTS the link stays pending for
+    enrich_pending_links.
+    """
+    if attempts >= settings.LINK_ENRICHMENT_MAX_ATTEMPTS:
+        logger.info(f"Link {link_id} left pending after {attempts} attempts")
+        return
+    delay = settings.CIRCUIT_BREAKER_COOLDOWN * attempts
+    run_later(delay, enqueue_link_enrichment, link_id, attempts + 1)
@@ -0,0 +1,17 @@
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class AuthenticatedAPITestCase(APITestCase):
+    """API test case logged in as ``self.user``."""
+
+    email = "user@example.com"
+
+    def setUp(self):
+        self.user = User.objects.create_user(email=self.email, password="password")
+        self.client.force_authenticate(self.user)
+        # AddAuthorizationHeaderMiddleware rejects requests without a token
+        # before authentication runs; force_authenticate ignores its value.
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer test")
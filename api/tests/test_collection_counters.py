@@ -0,0 +1,68 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Collection, Link
+
+User = get_user_model()
+
+
+class CollectionCounterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="collection-counters@example.com")
+        self.collection = Collection.objects.create(user=self.user, title="Reading")
+        now = timezone.now()
+        self.old, self.new = [
+            self.create_link(f"https://example.com/{index}", now - timedelta(days=days))
+            for index, days in enumerate([10, 1])
+        ]
+
+    def create_link(self, url, created_at):
+        link = Link(user=self.user, url=url)
+        link.save()
+        Link.objects.filter(pk=link.pk).update(created_at=created_at)
+        link.refresh_from_db()
+        return link
+
+    def assertCounters(self, link_count, last_link):
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.link_count, link_count)
+        self.assertEqual(
+            self.collection.last_link_added_at, last_link and last_link.created_at
+        )
+
+    def test_add_remove_and_delete(self):
+        self.collection.links.add(self.old)
+        self.assertCounters(1, self.old)
+        self.collection.links.add(self.new)
+        self.assertCounters(2, self.new)
+
+        # Removing the newest link goes back to the next newest one.
+        self.collection.links.remove(self.new)
+        self.assertCounters(1, self.old)
+
+        self.new.collections.add(self.collection)
+        self.old.delete()
+        self.assertCounters(1, self.new)
+        self.new.collections.clear()
+        self.assertCounters(0, None)
+
+    def test_repair_command(self):
+        self.collection.links.add(self.old, self.new)
+        Collection.objects.filter(pk=self.collection.pk).update(
+            link_count=7, last_link_added_at=timezone.now()
+        )
+        untouched = Collection.objects.create(user=self.user, title="Empty")
+
+        out = StringIO()
+        call_command("repair_collection_counters", stdout=out)
+
+        self.assertIn("Done: 1 of 2 collections repaired.", out.getvalue())
+        self.assertCounters(2, self.new)
+        untouched.refresh_from_db()
+        self.assertEqual(untouched.link_count, 0)
+        self.assertIsNone(untouched.last_link_added_at)
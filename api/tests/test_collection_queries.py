@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import Collection, Link
+from api.utils import canonical_url_hash, extract_host
+from api.views import CollectionViewSet
+
+User = get_user_model()
+
+# (collections, links per collection)
+SIZES = [(1, 1), (10, 5), (50, 20)]
+
+
+class CollectionQueryCountTests(TestCase):
+    """The number of queries of the collection endpoints must not grow with the data."""
+
+    def seed(self, collections, links):
+        user = User.objects.create_user(
+            email=f"collection-queries-{collections}-{links}@example.com"
+        )
+        urls = [f"https://example.com/collection-queries/{i}" for i in range(links)]
+        created_links = Link.objects.bulk_create(
+            Link(
+                user=user,
+                url=url,
+                url_hash=canonical_url_hash(url),
+                host=extract_host(url),
+            )
+            for url in urls
+        )
+        created_collections = Collection.objects.bulk_create(
+            Collection(user=user, title=f"collection {i}") for i in range(collections)
+        )
+        Collection.links.through.objects.bulk_create(
+            Collection.links.through(collection_id=collection.pk, link_id=link.pk)
+            for collection in created_collections
+            for link in created_links
+        )
+        return user, created_collections[0].pk
+
+    def request(self, user, actions, path, params=None, pk=None):
+        request = APIRequestFactory().get(path, params or {})
+        force_authenticate(request, user=user)
+        view = CollectionViewSet.as_view(actions)
+        response = view(request, pk=pk) if pk else view(request)
+        self.assertEqual(response.status_code, 200)
+        # Render inside the counted block: serialization may query too.
+        response.render()
+
+    def assertConstantQueries(self, actions, path, params=None, detail=False):
+        expected = None
+        for collections, links in SIZES:
+            user, pk = self.seed(collections, links)
+            args = (user, actions, path.format(pk=pk), params, pk if detail else None)
+            with self.subTest(collections=collections, links=links):
+                if expected is None:
+                    with CaptureQueriesContext(connection) as queries:
+                        self.request(*args)
+                    expected = len(queries)
+                else:
+                    with self.assertNumQueries(expected):
+                        self.request(*args)
+
+    def test_list(self):
+        self.assertConstantQueries({"get": "list"}, "/api/collections/")
+
+    def test_retrieve(self):
+        self.assertConstantQueries(
+            {"get": "retrieve"}, "/api/collections/{pk}/", detail=True
+        )
+
+    def test_links(self):
+        self.assertConstantQueries(
+            {"get": "links"}, "/api/collections/{pk}/links/", detail=True
+        )
+
+    def test_search(self):
+        self.assertConstantQueries(
+            {"get": "search"}, "/api/collections/search/", {"search": "collection"}
+        )
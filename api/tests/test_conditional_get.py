@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.utils.http import http_date
+
+from api.models import Collection, Link
+
+from .base import AuthenticatedAPITestCase
+
+User = get_user_model()
+
+
+class ConditionalGetTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.links = []
+        for index in range(2):
+            link = Link(user=self.user, url=f"https://example.com/{index}")
+            link.save()
+            self.links.append(link)
+        self.collection = Collection.objects.create(user=self.user, title="Reading")
+        self.collection.links.add(self.links[0])
+
+    def get(self, path, **headers):
+        return self.client.get(path, headers=headers)
+
+    def assertRevalidates(self, path):
+        """Fetch ``path`` and check that repeating it with the ETag gives 304."""
+        response = self.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        etag = response["ETag"]
+
+        not_modified = self.get(path, if_none_match=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], etag)
+        return etag
+
+    def test_link_list(self):
+        etag = self.assertRevalidates("/api/links/")
+
+        self.links[1].title = "Edited"
+        self.links[1].save()
+        self.assertEqual(self.get("/api/links/", if_none_match=etag).status_code, 200)
+
+    def test_link_list_changes_when_a_link_is_deleted(self):
+        etag = self.assertRevalidates("/api/links/")
+        # Deleting any but the newest link keeps max(updated_at) unchanged.
+        self.links[0].delete()
+        self.assertEqual(self.get("/api/links/", if_none_match=etag).status_code, 200)
+
+    def test_etag_covers_the_query_string(self):
+        etag = self.assertRevalidates("/api/links/")
+        response = self.get("/api/links/?type=video", if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_link_retrieve_if_modified_since(self):
+        path = f"/api/links/{self.links[0].pk}/"
+        response = self.get(path)
+        self.assertEqual(response.status_code, 200)
+        last_modified = response["Last-Modified"]
+
+        response = self.get(path, if_modified_since=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        # Edits to other links do not invalidate this one.
+        self.links[1].title = "Edited"
+        self.links[1].save()
+        self.assertEqual(self.get(path, if_modified_since=last_modified).status_code, 304)
+
+        self.links[0].refresh_from_db()
+        self.links[0].title = "Edited"
+        self.links[0].save()
+        stale = http_date(self.links[0].updated_at.timestamp() - 1)
+        self.assertEqual(self.get(path, if_modified_since=stale).status_code, 200)
+
+    def test_etag_is_per_user(self):
+        etag = self.assertRevalidates("/api/links/")
+        other = User.objects.create_user(email="other@example.com")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.get("/api/links/", if_none_match=etag).status_code, 200)
+
+    def test_collection_follows_embedded_link_edits(self):
+        path = f"/api/collections/{self.collection.pk}/"
+        etag = self.assertRevalidates(path)
+
+        # Not a member: the collection does not change.
+        self.links[1].title = "Edited"
+        self.links[1].save()
+        self.assertEqual(self.get(path, if_none_match=etag).status_code, 304)
+
+        self.links[0].title = "Edited"
+        self.links[0].save()
+        self.assertEqual(self.get(path, if_none_match=etag).status_code, 200)
+
+    def test_collection_list(self):
+        etag = self.assertRevalidates("/api/collections/")
+        self.collection.links.add(self.links[1])
+        response = self.get("/api/collections/", if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_writes_are_not_conditional(self):
+        response = self.get("/api/links/")
+        response = self.client.patch(
+            f"/api/links/{self.links[0].pk}/",
+            {"title": "Edited"},
+            headers={"if_none_match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 200)
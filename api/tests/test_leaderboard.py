@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from api.models import Link
+
+from .base import AuthenticatedAPITestCase
+
+User = get_user_model()
+
+
+class LeaderboardTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.joined = timezone.now() - timedelta(days=100)
+        self.link_index = 0
+        # Several ties on count and on date_joined, broken by user id.
+        self.users = [
+            self.create_user(index, links, joined_days_later)
+            for index, (links, joined_days_later) in enumerate(
+                [(3, 0), (2, 1), (2, 0), (2, 0), (1, 5), (1, 5), (1, 2)]
+            )
+        ]
+
+    def create_user(self, index, links, joined_days_later):
+        user = User.objects.create_user(
+            email=f"leader{index}@example.com",
+            date_joined=self.joined + timedelta(days=joined_days_later),
+        )
+        self.add_links(user, links)
+        return user
+
+    def add_links(self, user, count, link_type="website", days_ago=0):
+        created_at = timezone.now() - timedelta(days=days_ago)
+        for _ in range(count):
+            self.link_index += 1
+            link = Link(
+                user=user, url=f"https://example.com/{self.link_index}", type=link_type
+            )
+            # created_at is auto_now_add, so move the clock instead.
+            with mock.patch("django.utils.timezone.now", return_value=created_at):
+                link.save()
+
+    def get(self, **params):
+        response = self.client.get("/api/users/leaderboard/", params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def walk(self, limit, **params):
+        """All results, following the 'next' links ``limit`` users at a time."""
+        data = self.get(limit=limit, **params)
+        results = data["results"]
+        while data["next"]:
+            response = self.client.get(data["next"])
+            self.assertEqual(response.status_code, 200)
+            data = response.data
+            self.assertLessEqual(len(data["results"]), limit)
+            results += data["results"]
+        return results
+
+    def expected_order(self):
+        users = sorted(
+            self.users,
+            key=lambda user: (-user.links.count(), user.date_joined, user.pk),
+        )
+        return [user.email for user in users]
+
+    def test_pages_cover_the_ranking_once(self):
+        full = self.get(limit=100)["results"]
+        self.assertEqual([row["email"] for row in full], self.expected_order())
+        # self.user has no links and is left out.
+        self.assertNotIn(self.user.email, [row["email"] for row in full])
+
+        for limit in (1, 2, 3):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.walk(limit), full)
+        self.assertEqual([row["rank"] for row in full], list(range(1, len(full) + 1)))
+
+    def test_cursor_is_stable_under_concurrent_changes(self):
+        first = self.get(limit=3)
+        seen = [row["email"] for row in first["results"]]
+
+        # A user moving past the cursor, and a new user behind it.
+        self.add_links(self.users[-1], 5)
+        newcomer = User.objects.create_user(email="newcomer@example.com")
+        self.add_links(newcomer, 1)
+
+        rest = []
+        data = first
+        while data["next"]:
+            data = self.client.get(data["next"]).data
+            rest += data["results"]
+
+        emails = seen + [row["email"] for row in rest]
+        self.assertEqual(len(emails), len(set(emails)))
+        # The promoted user was already passed; everyone behind the cursor is listed.
+        self.assertNotIn(self.users[-1].email, emails)
+        self.assertIn(newcomer.email, emails)
+        self.assertEqual(rest[0]["rank"], 4)
+
+    def test_window_and_type(self):
+        self.add_links(self.users[-1], 10, days_ago=10)
+        self.add_links(self.users[-2], 4, link_type="book")
+
+        week = self.get(window=7, limit=1)["results"]
+        self.assertEqual(week[0]["email"], self.users[-2].email)
+        self.assertEqual(week[0]["count_links"], 5)
+
+        month = self.get(window=30, limit=1)["results"]
+        self.assertEqual(month[0]["email"], self.users[-1].email)
+        self.assertEqual(month[0]["count_links"], 11)
+
+        books = self.get(type="book")["results"]
+        self.assertEqual(
+            [(row["email"], row["count_links"]) for row in books],
+            [(self.users[-2].email, 4)],
+        )
+
+    def test_invalid_parameters(self):
+        for params in [{"cursor": "nope"}, {"window": 8}, {"limit": 0}, {"type": "x"}]:
+            with self.subTest(params=params):
+                response = self.client.get("/api/users/leaderboard/", params)
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+
+from api.models import Collection, Link, UserLinkStats
+
+from .base import AuthenticatedAPITestCase
+
+User = get_user_model()
+
+
+class LinkBulkTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.links = []
+        for index, link_type in enumerate(["video", "video", "book"]):
+            link = Link(
+                user=self.user, url=f"https://vimeo.com/{index}", type=link_type
+            )
+            link.save()
+            self.links.append(link)
+        self.collection = Collection.objects.create(user=self.user, title="Mine")
+        self.collection.links.add(*self.links)
+
+        self.other = User.objects.create_user(email="other@example.com")
+        self.other_link = Link(user=self.other, url="https://vimeo.com/other")
+        self.other_link.save()
+
+    def stats(self, user=None):
+        row = UserLinkStats.objects.get(user=user or self.user)
+        return {"total": row.total, "video": row.video, "book": row.book}
+
+    def test_delete_by_ids_updates_counters_and_collections(self):
+        response = self.client.post(
+            "/api/links/bulk-delete/", {"ids": [self.links[0].pk]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"deleted": 1})
+        self.assertFalse(Link.objects.filter(pk=self.links[0].pk).exists())
+        self.assertEqual(self.stats(), {"total": 2, "video": 1, "book": 1})
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.link_count, 2)
+
+    def test_delete_by_filter(self):
+        response = self.client.post(
+            "/api/links/bulk-delete/", {"filter": {"type": "video"}}, format="json"
+        )
+
+        self.assertEqual(response.json(), {"deleted": 2})
+        self.assertEqual(self.stats(), {"total": 1, "video": 0, "book": 1})
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.link_count, 1)
+
+    def test_links_of_other_users_are_not_selected(self):
+        ids = [self.links[0].pk, self.other_link.pk]
+        for path in ("/api/links/bulk-delete/", "/api/links/bulk-update/"):
+            with self.subTest(path=path):
+                data = {"ids": ids, "values": {"title": "Mine now"}}
+                response = self.client.post(path, data, format="json")
+                self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(Link.objects.filter(user=self.user).count(), 3)
+        self.other_link.refresh_from_db()
+        self.assertEqual(self.other_link.title, "")
+        self.assertEqual(self.stats(self.other)["total"], 1)
+
+    def test_empty_and_unknown_filters_are_rejected(self):
+        for selection in (
+            {"filter": {}},
+            {"filter": {"type": ""}},
+            {"filter": {"host": ""}},
+            {"filter": {"owner": "x"}},
+        ):
+            with self.subTest(selection=selection):
+                response = self.client.post(
+                    "/api/links/bulk-delete/", selection, format="json"
+                )
+                self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(Link.objects.filter(user=self.user).count(), 3)
+
+    def test_update_type_moves_counters(self):
+        response = self.client.post(
+            "/api/links/bulk-update/",
+            {"filter": {"type": "video"}, "values": {"type": "book"}},
+            format="json",
+        )
+
+        self.assertEqual(response.json(), {"updated": 2})
+        self.assertEqual(self.stats(), {"total": 3, "video": 0, "book": 3})
+        self.assertEqual(Link.objects.filter(user=self.user, type="book").count(), 3)
@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from api import tasks
+from api.host_guard import HostUnavailable
+from api.models import Link
+
+User = get_user_model()
+
+
+@override_settings(CIRCUIT_BREAKER_COOLDOWN=60, LINK_ENRICHMENT_MAX_ATTEMPTS=3)
+class LinkEnrichmentRetryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="enrichment@example.com")
+        self.link = Link(
+            user=self.user,
+            url="https://example.com/",
+            enrichment_status=Link.ENRICHMENT_PENDING,
+        )
+        self.link.save()
+
+    def test_unavailable_host_is_retried_after_the_cooldown(self):
+        with mock.patch(
+            "api.tasks.get_og_data", side_effect=HostUnavailable("open")
+        ), mock.patch("api.tasks.run_later") as run_later:
+            tasks.enrich_link_or_retry(self.link.pk, 1)
+            run_later.assert_called_once_with(
+                60, tasks.enqueue_link_enrichment, self.link.pk, 2
+            )
+
+            run_later.reset_mock()
+            tasks.enrich_link_or_retry(self.link.pk, 2)
+            run_later.assert_called_once_with(
+                120, tasks.enqueue_link_enrichment, self.link.pk, 3
+            )
+
+            # The last attempt leaves the link pending for enrich_pending_links.
+            run_later.reset_mock()
+            tasks.enrich_link_or_retry(self.link.pk, 3)
+            run_later.assert_not_called()
+
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.enrichment_status, Link.ENRICHMENT_PENDING)
+
+    def test_success_is_not_retried(self):
+        og_data = {"title": "T", "description": "D", "image": "I", "type": "video"}
+        with mock.patch("api.tasks.get_og_data", return_value=og_data), mock.patch(
+            "api.tasks.run_later"
+        ) as run_later:
+            tasks.enrich_link_or_retry(self.link.pk, 1)
+        run_later.assert_not_called()
+
+        self.link.refresh_from_db()
+        self.assertEqual(self.link.enrichment_status, Link.ENRICHMENT_READY)
+        self.assertEqual(self.link.type, "video")
+
+    def test_run_later_calls_in_due_order(self):
+        calls = []
+        done = tasks.threading.Event()
+
+        def record(name):
+            calls.append(name)
+            if len(calls) == 2:
+                done.set()
+
+        tasks.run_later(0.05, record, "second")
+        tasks.run_later(0, record, "first")
+        self.assertTrue(done.wait(5))
+        self.assertEqual(calls, ["first", "second"])
@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from api.filters import LinkFilter
+from api.link_bulk import select_link_ids
+from api.models import Link
+
+User = get_user_model()
+
+
+class LinkFilterTypeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="link-filters@example.com")
+        for index, link_type in enumerate(["video", "object", "error", "error"]):
+            Link(user=cls.user, url=f"https://example.com/{index}", type=link_type).save()
+
+    def filter(self, data):
+        filterset = LinkFilter(data, queryset=Link.objects.filter(user=self.user))
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        return filterset.qs
+
+    def test_enrichment_types(self):
+        # Set by enrichment, but not offered in Link.TYPE_CHOICES.
+        self.assertEqual(self.filter({"type": "error"}).count(), 2)
+        self.assertEqual(self.filter({"type": "object"}).count(), 1)
+        self.assertEqual(self.filter({"type__in": "object,error"}).count(), 3)
+
+    def test_unknown_type_is_rejected(self):
+        filterset = LinkFilter({"type": "podcast"}, queryset=Link.objects.all())
+        self.assertFalse(filterset.is_valid())
+        self.assertIn("type", filterset.errors)
+
+    def test_bulk_selection_by_enrichment_type(self):
+        link_ids = select_link_ids(self.user, filters={"type": "error"})
+        errors = self.filter({"type": "error"}).values_list("pk", flat=True)
+        self.assertEqual(set(link_ids), set(errors))
@@ -0,0 +1,135 @@
+import json
+from io import BytesIO
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api import link_import
+from api.link_import import build_links, insert_links, iter_json_urls
+from api.models import Link, UserLinkStats
+
+from .base import AuthenticatedAPITestCase
+
+
+class IterJsonUrlsTests(TestCase):
+    def parse(self, body):
+        return list(iter_json_urls(BytesIO(body.encode("utf-8"))))
+
+    def test_items_split_across_reads(self):
+        urls = [f"https://example.com/{'ä' * index}" for index in range(5)]
+        body = json.dumps([urls[0], {"url": urls[1]}, *urls[2:]], ensure_ascii=False)
+        # Small reads split items and multi-byte characters between chunks.
+        with mock.patch.object(link_import, "JSON_READ_SIZE", 3):
+            parsed = self.parse(body)
+        self.assertEqual([url for url, _ in parsed], urls)
+
+    def test_rejects_non_array(self):
+        with self.assertRaises(ValueError):
+            self.parse('{"url": "https://example.com/"}')
+
+    def test_empty_array(self):
+        self.assertEqual(self.parse(" [ ] "), [])
+
+    def test_syntax_error_ends_with_invalid_item(self):
+        parsed = self.parse('["https://example.com/a", oops]')
+        self.assertEqual(parsed[0][0], "https://example.com/a")
+        self.assertEqual(parsed[1], (None, "oops]"))
+
+    def test_oversized_item_is_not_buffered(self):
+        with mock.patch.object(link_import, "JSON_ITEM_MAX_LENGTH", 10):
+            parsed = self.parse('["https://example.com/' + "a" * 100)
+        self.assertEqual(len(parsed), 1)
+        self.assertIsNone(parsed[0][0])
+
+
+@override_settings(LINK_ENRICHMENT_ASYNC=True, LINK_IMPORT_BATCH_SIZE=2)
+class LinkImportTests(AuthenticatedAPITestCase):
+    def post_import(self, items):
+        return self.client.post("/api/links/import/", items, format="json")
+
+    def test_batches_and_duplicates(self):
+        Link(user=self.user, url="https://example.com/existing").save()
+        items = [
+            "https://example.com/a",
+            {"url": "https://example.com/b"},
+            "https://example.com/existing",
+            "https://example.com/a",  # saved by the first batch
+            "not a url",
+        ]
+        with mock.patch(
+            "api.link_import.Link.objects.bulk_create",
+            wraps=Link.objects.bulk_create,
+        ) as bulk_create:
+            response = self.post_import(items)
+
+        self.assertEqual(response.status_code, 200)
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(
+            statuses, ["created", "created", "duplicate", "duplicate", "invalid"]
+        )
+        self.assertEqual(response.data["summary"]["created"], 2)
+        self.assertFalse(response.data["truncated"])
+        # One insert per batch that had new links.
+        self.assertEqual(bulk_create.call_count, 1)
+        self.assertEqual(UserLinkStats.objects.get(user=self.user).total, 3)
+
+    def test_inserts_one_batch_at_a_time(self):
+        urls = [f"https://example.com/{index}" for index in range(5)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_import(urls)
+        self.assertEqual(response.data["summary"]["created"], 5)
+        inserts = [
+            query for query in queries if query["sql"].startswith('INSERT INTO "api_link"')
+        ]
+        self.assertEqual(len(inserts), 3)
+
+    @override_settings(LINK_IMPORT_MAX_URLS=2)
+    def test_truncated(self):
+        response = self.post_import([f"https://example.com/{i}" for i in range(3)])
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertTrue(response.data["truncated"])
+        self.assertEqual(Link.objects.filter(user=self.user).count(), 2)
+
+    def test_ndjson(self):
+        body = b'"https://example.com/a"\n\n{"url": "https://example.com/b"}\n{oops\n'
+        response = self.client.post(
+            "/api/links/import/", body, content_type="application/x-ndjson"
+        )
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(statuses, ["created", "created", "invalid"])
+
+    def test_rejects_non_array(self):
+        response = self.post_import({"url": "https://example.com/"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_concurrently_saved_urls_are_retried_without_them(self):
+        urls = [f"https://example.com/{index}" for index in range(3)]
+        links = build_links(self.user, urls, executor=None)
+        # Saved by another request after the existence check.
+        Link(user=self.user, url=urls[1]).save()
+
+        created = insert_links(self.user, links)
+
+        self.assertEqual([link.url for link in created], [urls[0], urls[2]])
+        self.assertEqual(Link.objects.filter(user=self.user).count(), 3)
+        # The failed attempt rolled back its counter update too.
+        self.assertEqual(UserLinkStats.objects.get(user=self.user).total, 3)
+
+    def test_concurrent_duplicates_are_reported(self):
+        url = "https://example.com/raced"
+        original = link_import.insert_links
+
+        def insert_after_concurrent_save(user, links):
+            Link(user=user, url=url).save()
+            return original(user, links)
+
+        with mock.patch(
+            "api.link_import.insert_links", side_effect=insert_after_concurrent_save
+        ):
+            response = self.post_import([url])
+
+        [result] = response.data["results"]
+        self.assertEqual(result["status"], "duplicate")
+        self.assertIn("concurrently", result["detail"])
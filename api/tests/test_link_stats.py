@@ -0,0 +1,126 @@
+from collections import Counter
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Collection, Link, UserLinkDailyStats, UserLinkStats
+
+User = get_user_model()
+
+
+class LinkCounterTests(TestCase):
+    """UserLinkStats / UserLinkDailyStats must always match a full recount."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="link-stats@example.com")
+        self.other = User.objects.create_user(email="link-stats-other@example.com")
+
+    def create_link(self, user, index, link_type="website", days_ago=0):
+        link = Link(user=user, url=f"https://example.com/{index}", type=link_type)
+        # created_at is auto_now_add, so move the clock instead.
+        created_at = timezone.now() - timedelta(days=days_ago)
+        with mock.patch("django.utils.timezone.now", return_value=created_at):
+            link.save()
+        return link
+
+    def assertCountersMatch(self, user):
+        links = Link.objects.filter(user=user)
+        stats = UserLinkStats.objects.get(user=user)
+        self.assertEqual(stats.total, links.count())
+        for link_type in UserLinkStats.TYPES:
+            with self.subTest(type=link_type):
+                self.assertEqual(
+                    getattr(stats, link_type), links.filter(type=link_type).count()
+                )
+
+        expected = Counter(
+            (timezone.localdate(link.created_at), link.type) for link in links
+        )
+        daily = {
+            (row.day, row.type): row.count
+            for row in UserLinkDailyStats.objects.filter(user=user).exclude(count=0)
+        }
+        self.assertEqual(daily, dict(expected))
+
+    def test_create_retype_and_delete(self):
+        links = [
+            self.create_link(self.user, 0, "video"),
+            self.create_link(self.user, 1, "video", days_ago=3),
+            self.create_link(self.user, 2, "book"),
+        ]
+        self.assertCountersMatch(self.user)
+        self.assertEqual(UserLinkDailyStats.objects.filter(user=self.user).count(), 3)
+
+        links[0].type = "music"
+        links[0].save()
+        self.assertCountersMatch(self.user)
+
+        links[1].delete()
+        self.assertCountersMatch(self.user)
+
+        Link.objects.filter(user=self.user, type="book").delete()
+        self.assertCountersMatch(self.user)
+        self.assertEqual(UserLinkStats.objects.get(user=self.user).total, 1)
+
+    def test_save_with_deferred_type(self):
+        link = self.create_link(self.user, 0, "video")
+
+        deferred = Link.objects.only("title").get(pk=link.pk)
+        deferred.title = "Edited"
+        deferred.save()
+        self.assertCountersMatch(self.user)
+
+        deferred = Link.objects.only("title").get(pk=link.pk)
+        deferred.type = "book"
+        deferred.save(update_fields=["type"])
+        self.assertCountersMatch(self.user)
+
+        Link.objects.only("title").get(pk=link.pk).delete()
+        self.assertCountersMatch(self.user)
+
+    def test_users_are_independent(self):
+        self.create_link(self.user, 0, "video")
+        self.create_link(self.other, 0, "video")
+        Link.objects.filter(user=self.other).delete()
+        self.assertCountersMatch(self.user)
+        self.assertCountersMatch(self.other)
+
+    def test_user_delete_cascade(self):
+        links = [self.create_link(self.user, index) for index in range(3)]
+        own = Collection.objects.create(user=self.user, title="Own")
+        own.links.add(*links)
+        # Other users can collect the deleted user's links.
+        shared = Collection.objects.create(user=self.other, title="Shared")
+        shared.links.add(links[0], self.create_link(self.other, 0))
+        self.create_link(self.other, 1, "book")
+
+        self.user.delete()
+
+        # The counter rows cascade with the user and are not recreated.
+        self.assertFalse(UserLinkStats.objects.filter(user_id=links[0].user_id).exists())
+        self.assertFalse(
+            UserLinkDailyStats.objects.filter(user_id=links[0].user_id).exists()
+        )
+        self.assertCountersMatch(self.other)
+
+        shared.refresh_from_db()
+        self.assertEqual(shared.link_count, 1)
+        self.assertEqual(
+            shared.last_link_added_at,
+            Link.objects.get(user=self.other, url="https://example.com/0").created_at,
+        )
+
+    def test_user_queryset_delete(self):
+        self.create_link(self.user, 0)
+        shared = Collection.objects.create(user=self.other, title="Shared")
+        shared.links.add(self.create_link(self.user, 1))
+
+        User.objects.filter(pk=self.user.pk).delete()
+
+        self.assertEqual(UserLinkStats.objects.count(), 1)
+        shared.refresh_from_db()
+        self.assertEqual(shared.link_count, 0)
+        self.assertIsNone(shared.last_link_added_at)
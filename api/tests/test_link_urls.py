@@ -0,0 +1,71 @@
+import hashlib
+from unittest import mock
+
+from django.test import override_settings
+
+from api.models import Link
+from api.utils import canonical_url_hash
+
+from .base import AuthenticatedAPITestCase
+
+
+@override_settings(LINK_ENRICHMENT_ASYNC=True)
+class LinkUrlHashTests(AuthenticatedAPITestCase):
+    def create_legacy_duplicate(self):
+        """A pair of links that collided when migration 0006 added url_hash."""
+        Link(user=self.user, url="https://example.com/page?utm_source=a").save()
+        url = "https://example.com/page?utm_source=b"
+        fallback = hashlib.sha256(f"raw:{url}".encode()).hexdigest()
+        # bulk_create() skips Link.save(), like the migration's backfill.
+        [link] = Link.objects.bulk_create(
+            [Link(user=self.user, url=url, url_hash=fallback, host="example.com")]
+        )
+        return Link.objects.get(pk=link.pk), fallback
+
+    def test_edit_keeps_fallback_hash_of_legacy_duplicate(self):
+        link, fallback = self.create_legacy_duplicate()
+
+        response = self.client.patch(f"/api/links/{link.pk}/", {"title": "Edited"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.put(
+            f"/api/links/{link.pk}/", {"url": link.url, "title": "Put"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        link.refresh_from_db()
+        self.assertEqual(link.title, "Put")
+        self.assertEqual(link.url_hash, fallback)
+
+    def test_changed_url_is_rehashed(self):
+        link = Link(user=self.user, url="https://example.com/a")
+        link.save()
+        link = Link.objects.get(pk=link.pk)
+        link.url = "https://www.example.com/b/"
+        link.save(update_fields=["url"])
+
+        link.refresh_from_db()
+        self.assertEqual(link.url_hash, canonical_url_hash("https://example.com/b"))
+        self.assertEqual(link.host, "example.com")
+
+    def test_concurrent_duplicate_on_create_is_a_400(self):
+        Link(user=self.user, url="https://example.com/a").save()
+
+        # The existence check misses the row, as if it was saved in between.
+        with mock.patch("api.views.link.canonical_url_hash", return_value="1" * 64):
+            response = self.client.post("/api/links/", {"url": "https://example.com/a"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "You have already added this link."})
+
+    def test_concurrent_duplicate_on_update_is_a_400(self):
+        Link(user=self.user, url="https://example.com/a").save()
+        link = Link(user=self.user, url="https://example.com/b")
+        link.save()
+
+        with mock.patch("api.serializers.canonical_url_hash", return_value="1" * 64):
+            response = self.client.patch(
+                f"/api/links/{link.pk}/", {"url": "https://example.com/a"}
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("url", response.json())
@@ -0,0 +1,109 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from api import og_cache
+from api.og_cache import DjangoOGCache, InMemoryOGCache, get_og_data
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class InMemoryOGCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch("api.og_cache.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = InMemoryOGCache(ttl=60, max_entries=2)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", {"title": "A"})
+        self.cache.set("b", {"title": "B"})
+        self.assertEqual(self.cache.get("a"), {"title": "A"})
+
+        self.cache.set("c", {"title": "C"})
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), {"title": "A"})
+        self.assertEqual(self.cache.get("c"), {"title": "C"})
+
+    def test_entries_expire(self):
+        self.cache.set("a", {"title": "A"})
+        self.cache.set("b", {"title": "B"}, ttl=5)
+
+        self.clock.now += 5
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), {"title": "A"})
+
+        self.clock.now += 55
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_clear(self):
+        self.cache.set("a", {"title": "A"})
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get("a"))
+
+
+@override_settings(OG_CACHE_TTL=60, OG_NEGATIVE_CACHE_TTL=5)
+class GetOGDataTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = InMemoryOGCache(ttl=60, max_entries=10)
+        for patcher in [
+            mock.patch("api.og_cache.time.monotonic", self.clock),
+            mock.patch("api.og_cache._backend", self.cache),
+            mock.patch("api.og_cache.stats", og_cache.CacheStats()),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fetch(self, url, og_data):
+        with mock.patch("api.og_cache.fetch_og_data", return_value=og_data) as fetch:
+            result = get_og_data(url)
+        return result, fetch.called
+
+    def test_positive_and_negative_ttl(self):
+        ok = {"title": "Page", "type": "website"}
+        error = {"title": "", "type": "error"}
+        self.assertEqual(self.fetch("https://example.com/ok", ok), (ok, True))
+        self.assertEqual(self.fetch("https://example.com/down", error), (error, True))
+
+        # Cached under the canonical URL.
+        self.assertEqual(self.fetch("https://EXAMPLE.com/ok", ok), (ok, False))
+        self.assertEqual(self.fetch("https://example.com/down", error), (error, False))
+
+        self.clock.now += 5
+        self.assertEqual(self.fetch("https://example.com/down", error), (error, True))
+        self.assertEqual(self.fetch("https://example.com/ok", ok), (ok, False))
+
+        self.assertEqual(
+            og_cache.stats.as_dict(),
+            {"hits": 3, "negative_hits": 1, "misses": 3, "hit_ratio": 0.5},
+        )
+
+
+class DjangoOGCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+    def test_namespaced_keys_and_ttl(self):
+        og = DjangoOGCache(ttl=60, max_entries=10, alias="default")
+        with mock.patch.object(og.cache, "set", wraps=og.cache.set) as cache_set:
+            og.set("https://example.com/", {"title": "Page"})
+            og.set("https://example.com/down", {"type": "error"}, ttl=5)
+
+        self.assertEqual(og.get("https://example.com/"), {"title": "Page"})
+        self.assertIsNone(cache.get("https://example.com/"))
+        keys_and_ttls = [(call.args[0], call.args[2]) for call in cache_set.call_args_list]
+        self.assertTrue(all(key.startswith("og-data:") for key, _ in keys_and_ttls))
+        self.assertEqual([ttl for _, ttl in keys_and_ttls], [60, 5])
@@ -0,0 +1,116 @@
+from django.test import SimpleTestCase
+
+from api.og_parser import parse_head_meta, parse_meta_bs4
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+{charset}
+<title>{title}</title>
+<meta property="og:title" content="{title}">
+<meta property="og:type" content="article">
+<meta property="og:description" content="{description}">
+<meta property="og:image" content="https://example.com/{image}.png">
+<meta name="description" content="Plain {description}">
+</head>
+<body><p>Body</p></body>
+</html>
+"""
+
+
+def make_page(encoding, charset="", title="Title & more", description="Description"):
+    return PAGE.format(
+        charset=charset, title=title, description=description, image="image"
+    ).encode(encoding)
+
+
+def split(content, size):
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+class HeadMetaParityTests(SimpleTestCase):
+    """The streamed parser must agree with the BeautifulSoup fallback."""
+
+    def assertParity(self, content, chunk_size=7, encoding=None):
+        streamed = parse_head_meta(
+            split(content, chunk_size), max_bytes=64 * 1024, encoding=encoding
+        )
+        self.assertEqual(streamed, parse_meta_bs4(content))
+        return streamed
+
+    def test_utf8(self):
+        meta = self.assertParity(make_page("utf-8", '<meta charset="utf-8">'))
+        self.assertEqual(meta["title"], "Title & more")
+        self.assertEqual(meta["og:type"], "article")
+
+    def test_utf8_multibyte_split_across_chunks(self):
+        content = make_page("utf-8", '<meta charset="utf-8">', title="Привет — 世界")
+        for chunk_size in (1, 2, 3, 5):
+            with self.subTest(chunk_size=chunk_size):
+                meta = self.assertParity(content, chunk_size)
+                self.assertEqual(meta["title"], "Привет — 世界")
+
+    def test_meta_charset_windows_1251(self):
+        content = make_page(
+            "windows-1251", '<meta charset="windows-1251">', title="Привет &amp; x"
+        )
+        meta = self.assertParity(content)
+        self.assertEqual(meta["title"], "Привет & x")
+
+    def test_http_equiv_koi8_r(self):
+        content = make_page(
+            "koi8-r",
+            '<meta http-equiv="Content-Type" content="text/html; charset=koi8-r">',
+            description="Описание",
+        )
+        meta = self.assertParity(content)
+        self.assertEqual(meta["og:description"], "Описание")
+
+    def test_meta_charset_after_first_chunk(self):
+        charset = "<!-- padding -->" * 20 + "<meta charset='iso-8859-2'>"
+        content = make_page("iso-8859-2", charset, title="Zażółć")
+        meta = self.assertParity(content, chunk_size=64)
+        self.assertEqual(meta["title"], "Zażółć")
+
+    def test_utf8_bom(self):
+        content = b"\xef\xbb\xbf" + make_page("utf-8", title="Ünïcode")
+        meta = self.assertParity(content)
+        self.assertEqual(meta["title"], "Ünïcode")
+
+    def test_entities_in_attributes(self):
+        self.assertParity(
+            make_page(
+                "utf-8",
+                '<meta charset="utf-8">',
+                description="A &quot;q&quot; &lt;b&gt;",
+            )
+        )
+
+    def test_first_value_wins(self):
+        content = make_page("utf-8").replace(
+            b"</head>", b'<meta property="og:title" content="Second"></head>'
+        )
+        meta = self.assertParity(content)
+        self.assertEqual(meta["og:title"], "Title & more")
+
+    def test_missing_tags(self):
+        self.assertParity(b"<html><head><title>Only</title></head><body></body></html>")
+
+
+class HeadMetaEncodingTests(SimpleTestCase):
+    def test_http_charset_wins_over_meta(self):
+        content = make_page("windows-1251", '<meta charset="utf-8">', title="Привет")
+        meta = parse_head_meta(split(content, 16), 64 * 1024, encoding="windows-1251")
+        self.assertEqual(meta["title"], "Привет")
+
+    def test_stops_at_body(self):
+        content = make_page("utf-8").replace(
+            b"<p>Body</p>", b'<meta property="og:video" content="x"><p>Body</p>'
+        )
+        meta = parse_head_meta(split(content, 16), 64 * 1024)
+        self.assertNotIn("og:video", meta)
+
+    def test_max_bytes(self):
+        content = b"<html><head>" + b" " * 4096 + b"<title>Late</title></head></html>"
+        meta = parse_head_meta(split(content, 512), max_bytes=2048)
+        self.assertNotIn("title", meta)
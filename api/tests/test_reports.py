@@ -0,0 +1,130 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.utils import timezone
+
+from api.models import Link, ReportJob
+from api.reports import atomic_file, generate_report, report_path
+
+from .base import AuthenticatedAPITestCase
+
+User = get_user_model()
+
+
+class ReportTests(AuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.reports_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.reports_dir)
+        settings = override_settings(REPORTS_DIR=self.reports_dir, REPORT_JOBS_KEEP=2)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        for index, link_type in enumerate(["video", "video", "book"]):
+            Link(user=self.user, url=f"https://example.com/{index}", type=link_type).save()
+
+    def request_report(self, run=False):
+        """POST a report request; with ``run`` the job runs inline on commit."""
+        with mock.patch("api.reports.run_in_background") as run_in_background:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post("/api/reports/")
+        self.assertEqual(response.status_code, 202)
+        if run_in_background.called:
+            func, *args = run_in_background.call_args.args
+            if run:
+                func(*args)
+        return response
+
+    def download(self, job_id, **headers):
+        return self.client.get(f"/api/reports/{job_id}/download/", headers=headers)
+
+    def test_enqueue_returns_the_job_in_progress(self):
+        first = self.request_report()
+        second = self.request_report()
+        self.assertEqual(first.data["id"], second.data["id"])
+        self.assertEqual(first.data["status"], ReportJob.STATUS_PENDING)
+        self.assertIsNone(first.data["download_url"])
+        self.assertTrue(first["Location"].endswith(f"/api/reports/{first.data['id']}/"))
+
+    def test_timed_out_job_does_not_block_new_ones(self):
+        stale = self.request_report().data["id"]
+        ReportJob.objects.filter(pk=stale).update(
+            status=ReportJob.STATUS_RUNNING,
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+
+        fresh = self.request_report().data["id"]
+
+        self.assertNotEqual(fresh, stale)
+        self.assertEqual(ReportJob.objects.get(pk=stale).status, ReportJob.STATUS_FAILED)
+
+    def test_generate_and_download(self):
+        job_id = self.request_report(run=True).data["id"]
+
+        job = self.client.get(f"/api/reports/{job_id}/").data
+        self.assertEqual(job["status"], ReportJob.STATUS_DONE)
+        self.assertEqual(job["row_count"], 1)
+
+        response = self.download(job_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.getvalue().decode())))
+        self.assertEqual(rows[0]["email"], self.user.email)
+        self.assertEqual(
+            (rows[0]["count_links"], rows[0]["video"], rows[0]["book"]), ("3", "2", "1")
+        )
+
+        not_modified = self.download(job_id, if_none_match=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_download_before_done_or_of_other_users(self):
+        job_id = self.request_report().data["id"]
+        self.assertEqual(self.download(job_id).status_code, 404)
+
+        generate_report(job_id)
+        other = User.objects.create_user(email="reports-other@example.com")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.download(job_id).status_code, 404)
+        self.assertEqual(self.client.get(f"/api/reports/{job_id}/").status_code, 404)
+
+    def test_failed_write_leaves_no_file(self):
+        job_id = self.request_report().data["id"]
+        with mock.patch("api.reports.save_to_csv", side_effect=OSError("disk full")):
+            generate_report(job_id)
+
+        job = ReportJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, ReportJob.STATUS_FAILED)
+        self.assertEqual(job.error, "disk full")
+        self.assertEqual(os.listdir(self.reports_dir), [])
+
+    def test_atomic_file_keeps_the_old_version_on_failure(self):
+        path = self.reports_dir / "report.csv"
+        path.write_text("old")
+        with self.assertRaises(RuntimeError):
+            with atomic_file(path) as tmp_path:
+                with open(tmp_path, "w") as file:
+                    file.write("partial")
+                raise RuntimeError
+        self.assertEqual(path.read_text(), "old")
+        self.assertEqual(os.listdir(self.reports_dir), ["report.csv"])
+
+        with atomic_file(path) as tmp_path:
+            with open(tmp_path, "w") as file:
+                file.write("new")
+        self.assertEqual(path.read_text(), "new")
+
+    def test_old_reports_are_pruned(self):
+        jobs = []
+        for _ in range(3):
+            jobs.append(ReportJob.objects.get(pk=self.request_report(run=True).data["id"]))
+
+        self.assertFalse(ReportJob.objects.filter(pk=jobs[0].pk).exists())
+        self.assertFalse(report_path(jobs[0]).exists())
+        self.assertTrue(all(report_path(job).exists() for job in jobs[1:]))
@@ -1,12 +1,20 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import CollectionViewSet, CustomTopUsersViewSet, LinkViewSet
+from .views import (
+    CollectionViewSet,
+    CustomTopUsersViewSet,
+    LinkViewSet,
+    OpsViewSet,
+    ReportViewSet,
+)
 
 router = DefaultRouter()
 router.register("links", LinkViewSet, basename="link")
 router.register("collections", CollectionViewSet, basename="collection")
 router.register("users", CustomTopUsersViewSet, basename="top-users")
+router.register("ops", OpsViewSet, basename="ops")
+router.register("reports", ReportViewSet, basename="report")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1,81 +1,91 @@
 import csv
+import hashlib
 import logging
 import os
 import re
 import uuid
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-import requests
-from bs4 import BeautifulSoup
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 
+from api.host_guard import HostUnavailable, guard_url
+from api.http_client import http_get, release_connection
 from api.models import PasswordResetCode
+from api.og_parser import parse_head_meta, parse_meta_bs4
 
 logger = logging.getLogger("api")
 
 User = get_user_model()
 
-
-def fetch_og_data(url):
-    try:
-        response = requests.get(url, timeout=5)
+# Only parameters that are known to never change the page: ref, user_id and
+# the like select real content on many sites.
+TRACKING_QUERY_PARAMS = {"fbclid", "gclid", "yclid"}
+TRACKING_QUERY_PREFIXES = ("utm_", "mc_")
+
+
+def classify_og_type(og_type):
+    if not og_type:
+        return "website"
+
+    og_type = og_type.lower()
+    if "music" in og_type:
+        return "music"
+    elif "book" in og_type:
+        return "book"
+    elif "article" in og_type or "blog" in og_type:
+        return "article"
+    elif "video" in og_type:
+        return "video"
+    elif "object" in og_type:
+        return "object"
+    return "website"
+
+
+def build_og_data(meta):
+    return {
+        "title": meta.get("og:title") or meta.get("title") or "No title available",
+        "description": (
+            meta.get("og:description") or meta.get("description") or "No description"
+        ),
+        "image": meta.get("og:image") or "No images",
+        "type": classify_og_type(meta.get("og:type")),
+    }
+
+
+def get_response_encoding(response):
+    if "charset" in response.headers.get("content-type", "").lower():
+        return response.encoding
+    return None
+
+
+def fetch_og_meta(url):
+    if settings.OG_PARSER == "bs4":
+        with guard_url(url):
+            response = http_get(url)
+            response.raise_for_status()
+        return parse_meta_bs4(response.content)
+
+    with guard_url(url), http_get(url, stream=True) as response:
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        og_type = (
-            soup.find("meta", property="og:type")["content"]
-            if soup.find("meta", property="og:type")
-            else None
+        chunks = response.iter_content(chunk_size=8192)
+        meta = parse_head_meta(
+            chunks,
+            max_bytes=settings.OG_MAX_HEAD_BYTES,
+            encoding=get_response_encoding(response),
         )
+        release_connection(response, chunks)
+        return meta
 
-        if og_type:
-            og_type = og_type.lower()
-            if "music" in og_type:
-                content_type = "music"
-            elif "book" in og_type:
-                content_type = "book"
-            elif "article" in og_type or "blog" in og_type:
-                content_type = "article"
-            elif "video" in og_type:
-                content_type = "video"
-            elif "object" in og_type:
-                content_type = "object"
-            else:
-                content_type = "website"
-        else:
-            content_type = "website"
-
-        og_data = {
-            "title": (
-                soup.find("meta", property="og:title")["content"]
-                if soup.find("meta", property="og:title")
-                else None
-            ),
-            "description": (
-                soup.find("meta", property="og:description")["content"]
-                if soup.find("meta", property="og:description")
-                else None
-            ),
-            "image": (
-                soup.find("meta", property="og:image")["content"]
-                if soup.find("meta", property="og:image")
-                else "No images"
-            ),
-            "type": content_type,
-        }
-
-        if not og_data["title"]:
-            og_data["title"] = soup.title.string if soup.title else "No title available"
 
-        if not og_data["description"]:
-            og_data["description"] = (
-                soup.find("meta", attrs={"name": "description"})["content"]
-                if soup.find("meta", attrs={"name": "description"})
-                else "No description"
-            )
-
-        return og_data
+def fetch_og_data(url):
+    try:
+        return build_og_data(fetch_og_meta(url))
 
+    except HostUnavailable:
+        # Not a property of the page: must not be cached or saved as an error.
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch Open Graph data for {url}: {e}")
         return {
@@ -86,11 +96,55 @@ def fetch_og_data(url):
         }
 
 
+def strip_scheme(url):
+    return re.sub(r"^https?://(www\.)?", "", url, flags=re.IGNORECASE)
+
+
 def extract_uri(url):
-    url = re.sub(r"^https?://(www\.)?", "", url, flags=re.IGNORECASE)
+    url = strip_scheme(url)
     return url.split("/", 1)[-1] if "/" in url else url
 
 
+def is_tracking_param(name):
+    name = name.lower()
+    return name.startswith(TRACKING_QUERY_PREFIXES) or name in TRACKING_QUERY_PARAMS
+
+
+def extract_host(url):
+    host = (urlsplit(url.strip()).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def canonicalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = extract_host(url)
+    if parts.port and not (
+        (scheme == "http" and parts.port == 80)
+        or (scheme == "https" and parts.port == 443)
+    ):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if path != "/":
+        path = path.rstrip("/")
+
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not is_tracking_param(key)
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def canonical_url_hash(url):
+    # http:// and https:// variants of a page are treated as the same link.
+    key = strip_scheme(canonicalize_url(url))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
 def save_to_csv(data, file_path):
     with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
         fieldnames = [
@@ -1,5 +1,7 @@
 from .collection import CollectionViewSet
 from .link import LinkViewSet
+from .ops import OpsViewSet
+from .report import ReportViewSet
 
 # noinspection PyUnresolvedReferences
 from .user import (
@@ -1,3 +1,6 @@
+from django.db import transaction
+from django.db.models import Prefetch
+from django.urls import reverse
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import permissions, status, viewsets
@@ -5,27 +8,90 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
+from ..conditional import ConditionalGetMixin
+from ..filters import NullsLastOrderingFilter, with_tiebreak
 from ..models import Collection, Link
+from ..pagination import (
+    CollectionLinksCursorPagination,
+    CreatedAtCursorPagination,
+    RankedPageNumberPagination,
+)
 from ..permissions import IsOwnerOrReadOnly
 from ..serializers import (
     CollectionDetailSerializer,
+    CollectionLinksSerializer,
+    CollectionSummarySerializer,
+    LinkDetailSerializer,
 )
 
 
-class CollectionViewSet(viewsets.ModelViewSet):
+class CollectionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Collection.objects.all()
     serializer_class = CollectionDetailSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = CreatedAtCursorPagination
+    conditional_actions = ("list", "retrieve", "search", "links")
+    filter_backends = [NullsLastOrderingFilter]
+    ordering_fields = ["created_at", "link_count", "last_link_added_at"]
+    ordering = ["-created_at", "-id"]
+    nulls_last_fields = ["last_link_added_at"]
 
     def get_queryset(self):
-        return Collection.objects.filter(user=self.request.user)
+        collections = Collection.objects.filter(user=self.request.user)
+        if self.action not in ("list", "search"):
+            return collections
+
+        # Collections embed their links; fetch them all in one extra query.
+        links = Link.objects.defer("search_vector", "url_hash", "host")
+        return collections.prefetch_related(Prefetch("links", queryset=links))
+
+    def get_validator_querysets(self):
+        # Collections embed their links, so link edits must change the
+        # validators too.
+        collections = Collection.objects.filter(user=self.request.user)
+        links = Link.objects.filter(user=self.request.user)
+        if self.action in ("retrieve", "links"):
+            collections = collections.filter(pk=self.kwargs["pk"])
+            links = links.filter(collections__pk=self.kwargs["pk"])
+        return [collections, links]
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def paginate_links(self, collection):
+        memberships = (
+            Collection.links.through.objects.filter(collection=collection)
+            .select_related("link")
+            .defer("link__search_vector")
+        )
+        paginator = CollectionLinksCursorPagination()
+        page = paginator.paginate_queryset(memberships, self.request, view=self)
+        # Page links point at the links sub-resource, also from retrieve.
+        url = reverse("collection-links", kwargs={"pk": collection.pk})
+        query = self.request.META.get("QUERY_STRING")
+        paginator.base_url = self.request.build_absolute_uri(
+            f"{url}?{query}" if query else url
+        )
+        links = [membership.link for membership in page]
+        return paginator, LinkDetailSerializer(links, many=True).data
+
+    def get_membership_response(self, collection, **counts):
+        collection.refresh_from_db(fields=["link_count"])
+        return Response(
+            {
+                "id": collection.id,
+                **counts,
+                "link_count": collection.link_count,
+                "updated_at": collection.updated_at,
+            },
+            status=status.HTTP_200_OK,
+        )
+
     @swagger_auto_schema(
         operation_summary="List User's Collections",
-        operation_description="Retrieve a list of collections owned by the authenticated user.",
+        operation_description="Retrieve a page of collections owned by the authenticated user, newest first. "
+        "Use the 'next'/'previous' cursor links to move between pages and 'page_size' to change the page size. "
+        "With 'ordering' (e.g. '-link_count' or '-last_link_added_at'), results are paginated by page number.",
         responses={
             200: openapi.Response(
                 description="Successfully retrieved list of collections.",
@@ -35,6 +101,13 @@ class CollectionViewSet(viewsets.ModelViewSet):
         },
     )
     def list(self, request, *args, **kwargs):
+        ordering = NullsLastOrderingFilter().get_ordering(
+            request, self.get_queryset(), self
+        )
+        # The filter appends the -id tiebreak, so ?ordering=-created_at is
+        # the default ordering too. The cursor can only follow that one.
+        if with_tiebreak(ordering or []) != self.ordering:
+            self._paginator = RankedPageNumberPagination()
         return super().list(request, *args, **kwargs)
 
     @swagger_auto_schema(
@@ -54,23 +127,77 @@ class CollectionViewSet(viewsets.ModelViewSet):
 
     @swagger_auto_schema(
         operation_summary="Retrieve a Collection",
-        operation_description="Get details of a specific collection using its unique ID.",
+        operation_description="Get details of a specific collection using its unique ID: its metadata, 'link_count' "
+        "and the first page of its links, newest first. Follow 'links.next' or use /collections/{id}/links/ "
+        "for the remaining pages.",
         responses={
             200: openapi.Response(
                 description="Successfully retrieved collection details.",
-                schema=CollectionDetailSerializer,
+                examples={
+                    "application/json": {
+                        "id": 1,
+                        "title": "Reading list",
+                        "description": None,
+                        "link_count": 120,
+                        "created_at": "2024-11-20T12:00:00Z",
+                        "updated_at": "2024-11-20T12:00:00Z",
+                        "links": {
+                            "next": "http://localhost:8000/api/collections/1/links/?cursor=cD0xMjA%3D",
+                            "results": [],
+                        },
+                    }
+                },
             ),
             404: "Collection not found.",
             403: "Forbidden - You do not have permission to access this collection.",
         },
     )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        collection = self.get_object()
+        paginator, links = self.paginate_links(collection)
+
+        data = CollectionSummarySerializer(collection).data
+        data["links"] = {"next": paginator.get_next_link(), "results": links}
+        return Response(data)
+
+    @swagger_auto_schema(
+        operation_summary="List Links of a Collection",
+        operation_description="Retrieve a page of the links in a collection, newest first. "
+        "Use the 'next'/'previous' cursor links to move between pages and 'page_size' to change the page size.",
+        manual_parameters=[
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="The pagination cursor value.",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                description="Number of results to return per page.",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="Successfully retrieved links of the collection.",
+                schema=LinkDetailSerializer(many=True),
+            ),
+            404: "Collection not found.",
+            403: "Forbidden - You do not have permission to access this collection.",
+        },
+    )
+    @action(detail=True, methods=["get"], url_path="links")
+    def links(self, request, *args, **kwargs):
+        paginator, links = self.paginate_links(self.get_object())
+        return paginator.get_paginated_response(links)
 
     @action(detail=False, methods=["get"], url_path="search")
     @swagger_auto_schema(
         operation_summary="Search Collections",
-        operation_description="Search for collections by title or by link ID. You can use either 'search' or 'link_id' or both.",
+        operation_description="Search for collections by title or by link ID. You can use either 'search' or 'link_id' or both. Results are paginated with a cursor.",
         manual_parameters=[
             openapi.Parameter(
                 "search",
@@ -127,8 +254,94 @@ class CollectionViewSet(viewsets.ModelViewSet):
                 {"detail": "No collections found matching the search criteria."}
             )
 
-        serializer = self.get_serializer(collections, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(collections)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_summary="Add Links to a Collection",
+        operation_description="Add the given links to a collection without resending its full membership. "
+        "Links already in the collection are ignored. Returns the number of added links, the new link count "
+        "and 'updated_at' as the collection's version.",
+        request_body=CollectionLinksSerializer,
+        responses={
+            200: openapi.Response(
+                description="Links added successfully.",
+                examples={
+                    "application/json": {
+                        "id": 1,
+                        "added": 2,
+                        "link_count": 12,
+                        "updated_at": "2024-11-20T12:00:00Z",
+                    }
+                },
+            ),
+            400: "Bad request - validation errors.",
+            403: "Forbidden - You do not have permission to update this collection.",
+            404: "Collection not found.",
+        },
+    )
+    @action(detail=True, methods=["post"], url_path="add-links")
+    def add_links(self, request, *args, **kwargs):
+        collection = self.get_object()
+        serializer = CollectionLinksSerializer(
+            data=request.data, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        link_ids = serializer.validated_data["link_ids"]
+
+        with transaction.atomic():
+            existing = set(
+                collection.links.filter(pk__in=link_ids).values_list("pk", flat=True)
+            )
+            new_ids = link_ids - existing
+            if new_ids:
+                collection.links.add(*new_ids)
+                collection.save(update_fields=["updated_at"])
+
+        return self.get_membership_response(collection, added=len(new_ids))
+
+    @swagger_auto_schema(
+        operation_summary="Remove Links from a Collection",
+        operation_description="Remove the given links from a collection without resending its full membership. "
+        "Links that are not in the collection are ignored. Returns the number of removed links, the new link "
+        "count and 'updated_at' as the collection's version.",
+        request_body=CollectionLinksSerializer,
+        responses={
+            200: openapi.Response(
+                description="Links removed successfully.",
+                examples={
+                    "application/json": {
+                        "id": 1,
+                        "removed": 2,
+                        "link_count": 10,
+                        "updated_at": "2024-11-20T12:00:00Z",
+                    }
+                },
+            ),
+            400: "Bad request - validation errors.",
+            403: "Forbidden - You do not have permission to update this collection.",
+            404: "Collection not found.",
+        },
+    )
+    @action(detail=True, methods=["post"], url_path="remove-links")
+    def remove_links(self, request, *args, **kwargs):
+        collection = self.get_object()
+        serializer = CollectionLinksSerializer(
+            data=request.data, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        link_ids = serializer.validated_data["link_ids"]
+
+        with transaction.atomic():
+            existing = set(
+                collection.links.filter(pk__in=link_ids).values_list("pk", flat=True)
+            )
+            if existing:
+                collection.links.remove(*existing)
+                collection.save(update_fields=["updated_at"])
+
+        return self.get_membership_response(collection, removed=len(existing))
 
     @swagger_auto_schema(
         operation_summary="Update a Collection",
@@ -1,4 +1,11 @@
-from django.db import models
+from collections import Counter
+from io import BytesIO
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import permissions, viewsets
@@ -7,45 +14,131 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
+from ..conditional import ConditionalGetMixin
+from ..filters import LinkFilter
+from ..link_bulk import bulk_delete_links, bulk_update_links
+from ..link_export import EXPORT_FORMATS, export_rows, iter_csv, iter_ndjson
+from ..link_import import (
+    get_import_executor,
+    import_links,
+    iter_json_urls,
+    iter_ndjson_urls,
+)
 from ..models import Link
+from ..pagination import CreatedAtCursorPagination, RankedPageNumberPagination
 from ..permissions import IsOwnerOrReadOnly
+from ..search import full_text_search, similarity_search, substring_search
 from ..serializers import (
+    LinkBulkSelectionSerializer,
+    LinkBulkUpdateSerializer,
     LinkCreateSerializer,
     LinkDetailSerializer,
+    LinkValuesSerializer,
 )
-from ..utils import extract_uri, fetch_og_data
+from ..tasks import (
+    apply_og_data,
+    enqueue_link_enrichment,
+    fetch_og_data_or_none,
+    retry_link_enrichment,
+)
+from ..utils import canonical_url_hash
 
+DUPLICATE_LINK_DETAIL = "You have already added this link."
 
-class LinkViewSet(viewsets.ModelViewSet):
+FIELDS_PARAMETER = openapi.Parameter(
+    "fields",
+    openapi.IN_QUERY,
+    description="Comma-separated list of fields to return, e.g. 'id,url,title'",
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+
+class LinkViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Link.objects.all()
     serializer_class = LinkDetailSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = CreatedAtCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = LinkFilter
 
     def get_queryset(self):
-        return Link.objects.filter(user=self.request.user)
+        links = Link.objects.filter(user=self.request.user).defer("search_vector")
+        if self.action == "retrieve":
+            links = links.only("user", *self.get_requested_fields())
+        return links
+
+    def get_validator_querysets(self):
+        links = Link.objects.filter(user=self.request.user)
+        if self.action == "retrieve":
+            links = links.filter(pk=self.kwargs["pk"])
+        return [links]
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action == "retrieve":
+            kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_requested_fields(self):
+        allowed = LinkDetailSerializer.Meta.fields
+        fields = self.request.query_params.get("fields")
+        if not fields:
+            return list(allowed)
+
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(requested) - set(allowed))
+        if unknown:
+            raise ValidationError(
+                {"fields": f"Unknown fields: {', '.join(unknown)}."}
+            )
+        return requested
+
+    def get_list_response(self, links):
+        # List and search responses skip model instances and serializer fields
+        # entirely: rows come from values() and are turned into dicts directly.
+        fields = self.get_requested_fields()
+        rows = links.values(*{*fields, "created_at"})
+        page = self.paginate_queryset(rows)
+        data = LinkValuesSerializer(fields).to_representation(page)
+        return self.get_paginated_response(data)
+
+    def get_bulk_selection(self, serializer):
+        return {
+            "ids": serializer.validated_data.get("ids"),
+            "filters": serializer.validated_data.get("filter"),
+        }
 
     @swagger_auto_schema(
         operation_summary="List User's Links",
-        operation_description="Retrieve a list of links owned by the authenticated user.",
+        operation_description="Retrieve a page of links owned by the authenticated user, newest first. "
+        "Use the 'next'/'previous' cursor links to move between pages and 'page_size' to change the page size. "
+        "Filter with 'type', 'type__in', 'host' and 'created_at__gte/lt', 'updated_at__gte/lt' (ISO 8601).",
+        manual_parameters=[FIELDS_PARAMETER],
         responses={
             200: openapi.Response(
                 description="Successfully retrieved list of links.",
                 schema=LinkDetailSerializer(many=True),
             ),
+            400: "Bad request - unknown field requested.",
             401: "Authentication credentials were not provided.",
         },
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return self.get_list_response(self.filter_queryset(self.get_queryset()))
 
     @swagger_auto_schema(
         operation_summary="Create a New Link",
-        operation_description="Create a new link using only the URL. Other fields will be populated automatically.",
+        operation_description="Create a new link using only the URL. Other fields will be populated automatically. "
+        "When background enrichment is enabled, the link is returned immediately with a 'pending' enrichment status.",
         request_body=LinkCreateSerializer,
         responses={
             201: openapi.Response(
                 "Link created successfully.", schema=LinkDetailSerializer
             ),
+            202: openapi.Response(
+                "Link created, metadata is being fetched in the background.",
+                schema=LinkDetailSerializer,
+            ),
             400: "Bad request - validation errors.",
         },
     )
@@ -55,28 +148,241 @@ class LinkViewSet(viewsets.ModelViewSet):
 
         url = serializer.validated_data["url"]
 
-        if Link.objects.filter(user=self.request.user, url=url).exists():
-            raise ValidationError({"detail": "You have already added this link."})
+        url_hash = canonical_url_hash(url)
+        if Link.objects.filter(user=self.request.user, url_hash=url_hash).exists():
+            raise ValidationError({"detail": DUPLICATE_LINK_DETAIL})
 
-        og_data = fetch_og_data(url)
+        if settings.LINK_ENRICHMENT_ASYNC:
+            try:
+                with transaction.atomic():
+                    link = serializer.save(
+                        user=self.request.user,
+                        enrichment_status=Link.ENRICHMENT_PENDING,
+                    )
+                    transaction.on_commit(lambda: enqueue_link_enrichment(link.id))
+            except IntegrityError:
+                # Saved by a concurrent request since the check above.
+                raise ValidationError({"detail": DUPLICATE_LINK_DETAIL})
 
-        if og_data:
-            link = serializer.save(
-                user=self.request.user,
-                title=og_data.get("title", ""),
-                description=og_data.get("description", ""),
-                image=og_data.get("image", ""),
-                type=og_data.get("type", "website"),
-            )
-        else:
-            link = serializer.save(user=self.request.user)
+            detail_serializer = LinkDetailSerializer(link)
+            return Response(detail_serializer.data, status=status.HTTP_202_ACCEPTED)
+
+        link = Link(url=url, user=self.request.user)
+        # Fetched before the transaction, so no locks are held over the network.
+        apply_og_data(link, fetch_og_data_or_none(url))
+        try:
+            with transaction.atomic():
+                link.save()
+                if link.enrichment_status == Link.ENRICHMENT_PENDING:
+                    # The host is busy or failing; retry once its breaker may close.
+                    transaction.on_commit(lambda: retry_link_enrichment(link.id))
+        except IntegrityError:
+            raise ValidationError({"detail": DUPLICATE_LINK_DETAIL})
 
         detail_serializer = LinkDetailSerializer(link)
+        if link.enrichment_status == Link.ENRICHMENT_PENDING:
+            return Response(detail_serializer.data, status=status.HTTP_202_ACCEPTED)
         return Response(detail_serializer.data, status=status.HTTP_201_CREATED)
 
+    @swagger_auto_schema(
+        operation_summary="Bulk Import Links",
+        operation_description=(
+            "Import many links in one request. Send a JSON array of URLs (or objects with a 'url' key) "
+            "with 'Content-Type: application/json', or one such item per line with "
+            "'Content-Type: application/x-ndjson'. URLs are processed in batches: duplicates are "
+            "detected with one query per batch, metadata is fetched concurrently and new links "
+            "are inserted with bulk_create. Returns a result for every submitted item. Both formats are "
+            "read as a stream; at most LINK_IMPORT_MAX_URLS items are imported and 'truncated' is true "
+            "when the body had more."
+        ),
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_URI),
+            example=["https://github.com/python/cpython", "https://vimeo.com/76979871"],
+        ),
+        responses={
+            200: openapi.Response(
+                description="Import finished; see per-URL results.",
+                examples={
+                    "application/json": {
+                        "summary": {"created": 1, "duplicate": 1},
+                        "truncated": False,
+                        "results": [
+                            {
+                                "url": "https://github.com/python/cpython",
+                                "status": "created",
+                                "id": 42,
+                                "enrichment_status": "ready",
+                            },
+                            {"url": "https://vimeo.com/76979871", "status": "duplicate"},
+                        ],
+                    }
+                },
+            ),
+            400: "Bad request - the body is not a JSON array.",
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="import")
+    def bulk_import(self, request, *args, **kwargs):
+        max_urls = settings.LINK_IMPORT_MAX_URLS
+
+        # Both formats are read from the request stream item by item, never
+        # loaded whole; items beyond the limit are skipped and reported with
+        # "truncated".
+        if request.content_type.startswith("application/x-ndjson"):
+            items = iter_ndjson_urls(request.stream or [])
+        else:
+            try:
+                items = iter_json_urls(request.stream or BytesIO())
+            except ValueError as e:
+                raise ValidationError({"detail": str(e)})
+
+        with get_import_executor() as executor:
+            results = list(
+                import_links(request.user, islice(items, max_urls), executor)
+            )
+            truncated = next(items, None) is not None
+
+        return Response(
+            {
+                "summary": Counter(result["status"] for result in results),
+                "truncated": truncated,
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Bulk Delete Links",
+        operation_description=(
+            "Delete many links at once, selected either by 'ids' or by a 'filter' object with the "
+            "list endpoint's filters (e.g. {\"type\": \"video\", \"host\": \"vimeo.com\"}). "
+            "All selected links must belong to the authenticated user; nothing is deleted otherwise. "
+            "Links are also removed from every collection that contains them."
+        ),
+        request_body=LinkBulkSelectionSerializer,
+        responses={
+            200: openapi.Response(
+                description="Links deleted successfully.",
+                examples={"application/json": {"deleted": 2}},
+            ),
+            400: "Bad request - validation errors.",
+            404: "Some of the links were not found.",
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-delete",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def bulk_delete(self, request, *args, **kwargs):
+        serializer = LinkBulkSelectionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        deleted = bulk_delete_links(request.user, **self.get_bulk_selection(serializer))
+        return Response({"deleted": deleted}, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="Bulk Update Links",
+        operation_description=(
+            "Set 'title', 'description', 'image' or 'type' on many links at once, selected either "
+            "by 'ids' or by a 'filter' object with the list endpoint's filters. All selected links "
+            "must belong to the authenticated user; nothing is updated otherwise."
+        ),
+        request_body=LinkBulkUpdateSerializer,
+        responses={
+            200: openapi.Response(
+                description="Links updated successfully.",
+                examples={"application/json": {"updated": 2}},
+            ),
+            400: "Bad request - validation errors.",
+            404: "Some of the links were not found.",
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-update",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def bulk_update(self, request, *args, **kwargs):
+        serializer = LinkBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        updated = bulk_update_links(
+            request.user,
+            serializer.validated_data["values"],
+            **self.get_bulk_selection(serializer),
+        )
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="Export Links",
+        operation_description=(
+            "Stream every link owned by the authenticated user, newest first, as NDJSON (default) or CSV. "
+            "Accepts the same filters and 'fields' as the list endpoint. With include_collections=true, "
+            "each row also lists in collection_ids the IDs of the collections containing the link."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "export_format",
+                openapi.IN_QUERY,
+                description="'ndjson' (default) or 'csv'",
+                type=openapi.TYPE_STRING,
+                enum=["ndjson", "csv"],
+                required=False,
+            ),
+            openapi.Parameter(
+                "include_collections",
+                openapi.IN_QUERY,
+                description="Include the IDs of the collections containing each link",
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+            ),
+            FIELDS_PARAMETER,
+        ],
+        responses={
+            200: "Streamed export file.",
+            400: "Bad request - unknown format or field.",
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def export(self, request, *args, **kwargs):
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"export_format": f"Must be one of: {', '.join(EXPORT_FORMATS)}."}
+            )
+        include_collections = (
+            request.query_params.get("include_collections", "").lower() in ("1", "true")
+        )
+
+        fields, rows = export_rows(
+            self.filter_queryset(self.get_queryset()),
+            self.get_requested_fields(),
+            include_collections,
+        )
+        if export_format == "csv":
+            content = iter_csv(rows, fields)
+        else:
+            content = iter_ndjson(rows)
+
+        response = StreamingHttpResponse(
+            content, content_type=EXPORT_FORMATS[export_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="links.{export_format}"'
+        return response
+
     @swagger_auto_schema(
         operation_summary="Retrieve a Link",
         operation_description="Get information about a specific link. Access is restricted to the owner of the link.",
+        manual_parameters=[FIELDS_PARAMETER],
         responses={
             200: openapi.Response(
                 description="Successfully retrieved link details.",
@@ -90,16 +396,35 @@ class LinkViewSet(viewsets.ModelViewSet):
         return super().retrieve(request, *args, **kwargs)
 
     @swagger_auto_schema(
-        operation_summary="Search Links by URL",
-        operation_description="Search for links owned by the authenticated user using match on 'url'.",
+        operation_summary="Search Links",
+        operation_description="Search for links owned by the authenticated user using match on 'url'. Results are paginated with a cursor. "
+        "With mode=similar, links are matched by trigram similarity of title or URL, ranked by similarity and paginated by page number. "
+        "With 'q', links are found by full-text search over title and description, ranked by relevance and paginated by page number. "
+        "The list filters ('type', 'host', date ranges) can be combined with any search mode.",
         manual_parameters=[
             openapi.Parameter(
                 "search",
                 openapi.IN_QUERY,
                 description="Search by match on URL (URI part only)",
                 type=openapi.TYPE_STRING,
-                required=True,
-            )
+                required=False,
+            ),
+            openapi.Parameter(
+                "mode",
+                openapi.IN_QUERY,
+                description="'substring' (default) or 'similar' for similarity-ranked results",
+                type=openapi.TYPE_STRING,
+                enum=["substring", "similar"],
+                required=False,
+            ),
+            openapi.Parameter(
+                "q",
+                openapi.IN_QUERY,
+                description="Full-text query over title and description (web search syntax: quotes, OR, -word)",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            FIELDS_PARAMETER,
         ],
         responses={
             200: openapi.Response(
@@ -117,19 +442,29 @@ class LinkViewSet(viewsets.ModelViewSet):
     )
     def search(self, request, *args, **kwargs):
         search_query = request.query_params.get("search", "").strip().lower()
+        text_query = request.query_params.get("q", "").strip()
+        mode = request.query_params.get("mode", "substring")
 
-        if not search_query:
+        if not search_query and not text_query:
             return Response(
-                {"detail": "Search parameter is required."},
+                {"detail": "Either 'search' or 'q' parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if mode not in ("substring", "similar"):
+            return Response(
+                {"detail": "Mode must be either 'substring' or 'similar'."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        cleaned_search_query = extract_uri(search_query)
-
-        links = Link.objects.filter(user=request.user).filter(
-            models.Q(title__iexact=search_query)
-            | models.Q(url__icontains=cleaned_search_query)
-        )
+        links = self.filter_queryset(self.get_queryset())
+        if text_query:
+            links = full_text_search(links, text_query)
+            self._paginator = RankedPageNumberPagination()
+        elif mode == "similar":
+            links = similarity_search(links, search_query)
+            self._paginator = RankedPageNumberPagination()
+        else:
+            links = substring_search(links, search_query)
 
         if not links.exists():
             return Response(
@@ -137,8 +472,7 @@ class LinkViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = self.get_serializer(links, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_list_response(links)
 
     @swagger_auto_schema(
         operation_summary="Update a Link",
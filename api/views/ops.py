@@ -0,0 +1,150 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from ..host_guard import get_host_stats
+from ..http_client import get_pool_stats
+from ..og_cache import get_cache_stats
+from ..reports import iter_breakdown_export
+
+logger = logging.getLogger("api")
+
+
+class OpsViewSet(viewsets.ViewSet):
+    permission_classes = [permissions.IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_summary="Open Graph Cache Stats",
+        operation_description="Hit/miss counters and settings of the Open Graph metadata cache in this process. Staff only.",
+        responses={
+            200: openapi.Response(
+                description="Cache statistics",
+                examples={
+                    "application/json": {
+                        "hits": 120,
+                        "negative_hits": 4,
+                        "misses": 30,
+                        "hit_ratio": 0.8,
+                        "backend": "api.og_cache.InMemoryOGCache",
+                        "ttl": 86400,
+                        "negative_ttl": 300,
+                        "max_entries": 10000,
+                        "size": 30,
+                    }
+                },
+            ),
+            403: "Forbidden - staff only.",
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="og-cache")
+    def og_cache(self, request):
+        return Response(get_cache_stats(), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="Outbound HTTP Pool Stats",
+        operation_description="Per-host connection pool usage of the shared outbound HTTP client in this process. Staff only.",
+        responses={
+            200: openapi.Response(
+                description="Connection pool statistics",
+                examples={
+                    "application/json": {
+                        "pool_connections": 100,
+                        "pool_maxsize": 10,
+                        "pool_block": False,
+                        "connect_timeout": 3.05,
+                        "read_timeout": 5.0,
+                        "pools": [
+                            {
+                                "scheme": "https",
+                                "host": "github.com",
+                                "port": 443,
+                                "maxsize": 10,
+                                "in_use": 0,
+                                "idle": 2,
+                                "connections_opened": 2,
+                                "requests": 14,
+                            }
+                        ],
+                    }
+                },
+            ),
+            403: "Forbidden - staff only.",
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="http-pools")
+    def http_pools(self, request):
+        return Response(get_pool_stats(), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="Outbound Host Breakers",
+        operation_description="Circuit breaker state and in-flight counts per outbound host in this process. Staff only.",
+        responses={
+            200: openapi.Response(
+                description="Per-host breaker state",
+                examples={
+                    "application/json": {
+                        "max_in_flight": 4,
+                        "failure_threshold": 3,
+                        "cooldown": 60.0,
+                        "hosts": [
+                            {
+                                "host": "www.bbc.com",
+                                "state": "open",
+                                "in_flight": 0,
+                                "consecutive_failures": 3,
+                                "short_circuited": 12,
+                                "rejected": 0,
+                                "retry_in": 41.5,
+                            }
+                        ],
+                    }
+                },
+            ),
+            403: "Forbidden - staff only.",
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="hosts")
+    def hosts(self, request):
+        return Response(get_host_stats(), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="Export User Link Breakdown",
+        operation_description="Stream the per-type link counts of every user as CSV, read from a server-side "
+        "cursor in chunks. With gzip=true the CSV is gzipped on the fly. 'X-Total-Count' holds the number of "
+        "users when the export started; progress is logged per chunk. Staff only.",
+        manual_parameters=[
+            openapi.Parameter(
+                "gzip",
+                openapi.IN_QUERY,
+                description="Gzip the CSV",
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+            ),
+        ],
+        responses={
+            200: "Streamed CSV (or gzipped CSV) file.",
+            403: "Forbidden - staff only.",
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="user-breakdown")
+    def user_breakdown(self, request):
+        use_gzip = request.query_params.get("gzip", "").lower() in ("1", "true")
+        total = get_user_model().objects.count()
+
+        def log_progress(exported):
+            logger.info(f"User breakdown export: {exported} of ~{total} users")
+
+        response = StreamingHttpResponse(
+            iter_breakdown_export(use_gzip, progress=log_progress),
+            content_type="application/gzip" if use_gzip else "text/csv",
+        )
+        filename = "user_breakdown.csv.gz" if use_gzip else "user_breakdown.csv"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["X-Total-Count"] = str(total)
+        return response
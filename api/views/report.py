@@ -0,0 +1,106 @@
+from django.http import FileResponse
+from drf_yasg import openapi
+from drf_yasg.utils import no_body, swagger_auto_schema
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+from ..conditional import ConditionalGetMixin
+from ..models import ReportJob
+from ..pagination import CreatedAtCursorPagination
+from ..reports import enqueue_report, report_path
+from ..serializers import ReportJobSerializer
+
+
+class ReportViewSet(
+    ConditionalGetMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    serializer_class = ReportJobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtCursorPagination
+    conditional_actions = ("retrieve", "download")
+
+    def get_queryset(self):
+        return ReportJob.objects.filter(user=self.request.user)
+
+    def get_validator_querysets(self):
+        return [self.get_queryset().filter(pk=self.kwargs["pk"])]
+
+    @swagger_auto_schema(
+        operation_summary="Request a Top Users Report",
+        operation_description="Start generating the top users CSV report in the background. If a report of the "
+        "authenticated user is already pending or running, that job is returned instead of starting a new one. "
+        "Poll the job until its status is 'done', then fetch the file from 'download_url'.",
+        request_body=no_body,
+        responses={
+            202: openapi.Response(
+                description="Report job accepted.",
+                examples={
+                    "application/json": {
+                        "id": 7,
+                        "status": "pending",
+                        "row_count": None,
+                        "error": "",
+                        "created_at": "2024-01-12T10:30:45Z",
+                        "finished_at": None,
+                        "download_url": None,
+                    }
+                },
+            ),
+        },
+    )
+    def create(self, request, *args, **kwargs):
+        job = enqueue_report(request.user)
+        serializer = self.get_serializer(job)
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": self.reverse_action("detail", args=[job.pk])},
+        )
+
+    @swagger_auto_schema(
+        operation_summary="List Reports",
+        operation_description="Report jobs of the authenticated user, newest first.",
+        responses={200: ReportJobSerializer(many=True)},
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_summary="Retrieve a Report",
+        operation_description="Status of a report job. Supports ETag / Last-Modified revalidation, so polling "
+        "with If-None-Match answers 304 until the job changes.",
+        responses={
+            200: ReportJobSerializer,
+            404: "Report not found.",
+        },
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_summary="Download a Report",
+        operation_description="The generated CSV file. Every job writes its own file, so the ETag / "
+        "Last-Modified validators never change for a job and revalidation answers 304.",
+        responses={
+            200: "CSV file.",
+            304: "Not modified.",
+            404: "Report not found, not finished yet, or its file was removed.",
+        },
+    )
+    @action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ReportJob.STATUS_DONE:
+            raise NotFound("The report is not ready.")
+        try:
+            file = open(report_path(job), "rb")
+        except FileNotFoundError:
+            raise NotFound("The report file is no longer available.")
+        return FileResponse(
+            file, as_attachment=True, filename="top_users.csv", content_type="text/csv"
+        )
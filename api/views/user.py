@@ -1,7 +1,4 @@
-import os
-
 from django.contrib.auth import get_user_model
-from django.db import connection
 from djoser.views import UserViewSet
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -9,6 +6,7 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -16,12 +14,15 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+from api.leaderboard import WINDOWS, get_leaderboard
+from api.reports import fetch_top_users
 from api.serializers import (
     CustomPasswordResetConfirmSerializer,
     CustomPasswordResetSerializer,
     CustomTokenObtainPairSerializer,
+    LeaderboardQuerySerializer,
 )
-from api.utils import save_to_csv, send_password_reset_email
+from api.utils import send_password_reset_email
 
 User = get_user_model()
 
@@ -206,7 +207,8 @@ class CustomTopUsersViewSet(viewsets.ViewSet):
     )
     @swagger_auto_schema(
         operation_summary="Top 10 Users",
-        operation_description="Retrieve top 10 users with the highest number of links, sorted by date of registration.",
+        operation_description="Retrieve top 10 users with the highest number of links, sorted by date of registration. "
+        "To get the same data as a CSV file, request a report via POST /api/reports/.",
         responses={
             200: openapi.Response(
                 description="Top 10 users retrieved successfully",
@@ -229,37 +231,107 @@ class CustomTopUsersViewSet(viewsets.ViewSet):
         },
     )
     def top_users(self, request):
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        sql_file_path = os.path.join(base_dir, "top_users.sql")
-
-        if not os.path.exists(sql_file_path):
+        try:
+            users_data = fetch_top_users()
+        except FileNotFoundError:
             return Response(
                 {"error": "SQL file not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        with open(sql_file_path, "r") as file:
-            query = file.read()
-
-        with connection.cursor() as cursor:
-            cursor.execute(query)
-            results = cursor.fetchall()
+        return Response(users_data, status=status.HTTP_200_OK)
 
-        users_data = [
-            {
-                "email": row[0],
-                "count_links": row[1],
-                "website": row[2],
-                "book": row[3],
-                "article": row[4],
-                "music": row[5],
-                "video": row[6],
-                "object": row[7],
-                "error": row[8],
-            }
-            for row in results
-        ]
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="leaderboard",
+    )
+    @swagger_auto_schema(
+        operation_summary="Links Leaderboard",
+        operation_description="Rank users by the number of links added in the last 'window' days, optionally of one "
+        "'type'. Ties are broken by date of registration. Use the 'next' cursor link to page through the ranking.",
+        manual_parameters=[
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description="Number of users per page (1-100)",
+                type=openapi.TYPE_INTEGER,
+                default=10,
+            ),
+            openapi.Parameter(
+                "type",
+                openapi.IN_QUERY,
+                description="Only count links of this type",
+                type=openapi.TYPE_STRING,
+                enum=["website", "book", "article", "music", "video", "object", "error"],
+            ),
+            openapi.Parameter(
+                "window",
+                openapi.IN_QUERY,
+                description="Number of days to count links over",
+                type=openapi.TYPE_INTEGER,
+                enum=list(WINDOWS),
+                default=30,
+            ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="The pagination cursor value.",
+                type=openapi.TYPE_STRING,
+            ),
+        ],
+        responses={
+            200: openapi.Response(
+                description="Leaderboard page retrieved successfully",
+                examples={
+                    "application/json": {
+                        "window": 30,
+                        "type": "book",
+                        "next": "http://localhost:8000/api/users/leaderboard/?type=book&cursor=WzEyLCAi...",
+                        "results": [
+                            {
+                                "rank": 1,
+                                "email": "user1@example.com",
+                                "count_links": 12,
+                                "date_joined": "2024-01-12T10:30:45Z",
+                            },
+                        ],
+                    }
+                },
+            ),
+            400: "Invalid parameters",
+        },
+    )
+    def leaderboard(self, request):
+        serializer = LeaderboardQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
 
-        output_file_path = os.path.join(base_dir, "top_users_output.csv")
-        save_to_csv(users_data, output_file_path)
+        rows, next_cursor = get_leaderboard(
+            params["window"],
+            link_type=params.get("type"),
+            limit=params["limit"],
+            cursor=params.get("cursor"),
+        )
 
-        return Response(users_data, status=status.HTTP_200_OK)
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", next_cursor
+            )
+        return Response(
+            {
+                "window": params["window"],
+                "type": params.get("type"),
+                "next": next_url,
+                "results": [
+                    {
+                        "rank": row["rank"],
+                        "email": row["email"],
+                        "count_links": row["count_links"],
+                        "date_joined": row["date_joined"],
+                    }
+                    for row in rows
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "djoser",
     "rest_framework_simplejwt",
@@ -183,8 +184,62 @@ REST_FRAMEWORK = {
     ],
 }
 
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+
 AUTH_USER_MODEL = "api.CustomUser"
 
+# Open Graph enrichment of new links
+LINK_ENRICHMENT_ASYNC = os.getenv("LINK_ENRICHMENT_ASYNC", "False") == "True"
+LINK_ENRICHMENT_WORKERS = int(os.getenv("LINK_ENRICHMENT_WORKERS", "4"))
+# Tries per link while its host is unavailable, CIRCUIT_BREAKER_COOLDOWN apart.
+LINK_ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("LINK_ENRICHMENT_MAX_ATTEMPTS", "3"))
+
+# Bulk link import
+LINK_IMPORT_MAX_URLS = int(os.getenv("LINK_IMPORT_MAX_URLS", "10000"))
+LINK_IMPORT_BATCH_SIZE = int(os.getenv("LINK_IMPORT_BATCH_SIZE", "500"))
+LINK_IMPORT_FETCH_WORKERS = int(os.getenv("LINK_IMPORT_FETCH_WORKERS", "8"))
+
+# Bulk link update / delete
+LINK_BULK_MAX_IDS = int(os.getenv("LINK_BULK_MAX_IDS", "1000"))
+
+# Streaming link export
+LINK_EXPORT_CHUNK_SIZE = int(os.getenv("LINK_EXPORT_CHUNK_SIZE", "2000"))
+
+# Asynchronous CSV reports (top users)
+REPORTS_DIR = Path(os.getenv("REPORTS_DIR", BASE_DIR / "reports"))
+REPORT_JOBS_KEEP = int(os.getenv("REPORT_JOBS_KEEP", "5"))
+REPORT_JOB_TIMEOUT = int(os.getenv("REPORT_JOB_TIMEOUT", "600"))
+USER_BREAKDOWN_CHUNK_SIZE = int(os.getenv("USER_BREAKDOWN_CHUNK_SIZE", "5000"))
+
+# Shared outbound HTTP client (per-host keep-alive connection pools)
+OUTBOUND_HTTP_CONNECT_TIMEOUT = float(os.getenv("OUTBOUND_HTTP_CONNECT_TIMEOUT", "3.05"))
+OUTBOUND_HTTP_READ_TIMEOUT = float(os.getenv("OUTBOUND_HTTP_READ_TIMEOUT", "5"))
+OUTBOUND_HTTP_POOL_CONNECTIONS = int(os.getenv("OUTBOUND_HTTP_POOL_CONNECTIONS", "100"))
+OUTBOUND_HTTP_POOL_MAXSIZE = int(os.getenv("OUTBOUND_HTTP_POOL_MAXSIZE", "10"))
+OUTBOUND_HTTP_POOL_BLOCK = os.getenv("OUTBOUND_HTTP_POOL_BLOCK", "False") == "True"
+OUTBOUND_HTTP_DRAIN_LIMIT = int(os.getenv("OUTBOUND_HTTP_DRAIN_LIMIT", "65536"))
+OUTBOUND_HTTP_MAX_PER_HOST = int(os.getenv("OUTBOUND_HTTP_MAX_PER_HOST", "4"))
+OUTBOUND_HTTP_HOST_WAIT_TIMEOUT = float(os.getenv("OUTBOUND_HTTP_HOST_WAIT_TIMEOUT", "2"))
+OUTBOUND_HTTP_USER_AGENT = os.getenv(
+    "OUTBOUND_HTTP_USER_AGENT", "Mozilla/5.0 (compatible; LinkPreviewBot/1.0)"
+)
+
+# Circuit breaker for hosts that keep failing
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "3"))
+CIRCUIT_BREAKER_COOLDOWN = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN", "60"))
+CIRCUIT_BREAKER_MAX_TRACKED_HOSTS = int(os.getenv("CIRCUIT_BREAKER_MAX_TRACKED_HOSTS", "10000"))
+
+# Open Graph metadata extraction: "stream" reads only the <head>, "bs4" parses the whole page
+OG_PARSER = os.getenv("OG_PARSER", "stream")
+OG_MAX_HEAD_BYTES = int(os.getenv("OG_MAX_HEAD_BYTES", "262144"))
+
+# Open Graph metadata cache, keyed by canonical URL
+OG_CACHE_BACKEND = os.getenv("OG_CACHE_BACKEND", "api.og_cache.InMemoryOGCache")
+OG_CACHE_ALIAS = os.getenv("OG_CACHE_ALIAS", "default")
+OG_CACHE_TTL = int(os.getenv("OG_CACHE_TTL", "86400"))
+OG_CACHE_MAX_ENTRIES = int(os.getenv("OG_CACHE_MAX_ENTRIES", "10000"))
+OG_NEGATIVE_CACHE_TTL = int(os.getenv("OG_NEGATIVE_CACHE_TTL", "300"))
+
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
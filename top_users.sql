@@ -1,28 +1,18 @@
-WITH link_counts AS (SELECT u.email,
-                            u.date_joined,
-                            COUNT(l.id)                                         AS count_links,
-                            SUM(CASE WHEN l.type = 'website' THEN 1 ELSE 0 END) AS website,
-                            SUM(CASE WHEN l.type = 'book' THEN 1 ELSE 0 END)    AS book,
-                            SUM(CASE WHEN l.type = 'article' THEN 1 ELSE 0 END) AS article,
-                            SUM(CASE WHEN l.type = 'music' THEN 1 ELSE 0 END)   AS music,
-                            SUM(CASE WHEN l.type = 'video' THEN 1 ELSE 0 END)   AS video,
-                            SUM(CASE WHEN l.type = 'object' THEN 1 ELSE 0 END)  AS object,
-                            SUM(CASE WHEN l.type = 'error' THEN 1 ELSE 0 END)   AS error
-                     FROM api_customuser AS u
-                              LEFT JOIN
-                          api_link AS l ON u.id = l.user_id
-                     GROUP BY u.id, u.email, u.date_joined)
-SELECT email,
-       count_links,
-       website,
-       book,
-       article,
-       music,
-       video,
-       object,
-       error,
-       date_joined
-FROM link_counts
-ORDER BY count_links DESC,
-         date_joined ASC
+-- Reads the per-user counters in api_userlinkstats, which are maintained on
+-- every link write (see api/link_stats.py) instead of aggregating api_link.
+SELECT u.email,
+       s.total AS count_links,
+       s.website,
+       s.book,
+       s.article,
+       s.music,
+       s.video,
+       s.object,
+       s.error,
+       u.date_joined
+FROM api_userlinkstats AS s
+         JOIN
+     api_customuser AS u ON u.id = s.user_id
+ORDER BY s.total DESC,
+         u.date_joined ASC
 LIMIT 10;
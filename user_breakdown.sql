@@ -0,0 +1,20 @@
+-- Per-type link counts of every user, for the full-population export
+-- (api/reports.py). Ordered by the primary keys so that both sides are read
+-- in index order and rows stream out of a server-side cursor immediately.
+-- The cursor must be opened inside a transaction: a WITH HOLD cursor, as
+-- declared in autocommit mode, is materialized in full before the first fetch.
+SELECT u.id,
+       u.email,
+       u.date_joined,
+       COALESCE(s.total, 0)   AS count_links,
+       COALESCE(s.website, 0) AS website,
+       COALESCE(s.book, 0)    AS book,
+       COALESCE(s.article, 0) AS article,
+       COALESCE(s.music, 0)   AS music,
+       COALESCE(s.video, 0)   AS video,
+       COALESCE(s.object, 0)  AS object,
+       COALESCE(s.error, 0)   AS error
+FROM api_customuser AS u
+         LEFT JOIN
+     api_userlinkstats AS s ON s.user_id = u.id
+ORDER BY u.id;